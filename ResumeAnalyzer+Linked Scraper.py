@@ -1,21 +1,25 @@
+import uuid
+
 import streamlit as st
-import pandas as pd
-import time
-import json
-from PyPDF2 import PdfReader
-from docx import Document as DocxReader
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.embeddings import OpenAIEmbeddings
-from langchain_community.chat_models import ChatOpenAI
-from langchain.chains.question_answering import load_qa_chain
-import plotly.graph_objects as go
+
+# Selenium, LangChain, Plotly and pandas are imported where they are first used, so a
+# cold server process renders the page without loading the scraper or LLM stack.
+import background_tasks  # noqa: F401  (registers the task handlers)
+from analysis_cache import content_hash
+from fix_lexicon import FIX_CATEGORIES
+from task_queue import FINISHED, get_task_queue
+from telemetry import TELEMETRY_ADMIN, get_telemetry
+from resume_analysis import (
+    ANALYSIS_MODE,
+    FIXES_ENGINE,
+    FIXES_ENGINES,
+    MAX_CONCURRENCY,
+    get_score_explanation,
+    score_label_and_prompt,
+)
+
+# How often a page showing a running task checks on it
+POLL_SECONDS = 0.5
 
 # ---------------------- Dropdown of Countries ----------------------
 countries = sorted([
@@ -26,71 +30,11 @@ countries = sorted([
 ])
 
 # ---------------------- Resume Analyzer ----------------------
-def resume_to_chunks(uploaded_file):
-    text = ""
-    if uploaded_file.name.endswith(".pdf"):
-        reader = PdfReader(uploaded_file)
-        text = "".join(page.extract_text() for page in reader.pages if page.extract_text())
-    elif uploaded_file.name.endswith(".docx"):
-        doc = DocxReader(uploaded_file)
-        text = "\n".join([para.text for para in doc.paragraphs])
-    else:
-        st.error("Unsupported file format. Please upload PDF or DOCX.")
-        return [], ""
-    splitter = RecursiveCharacterTextSplitter(chunk_size=700, chunk_overlap=200)
-    return splitter.split_text(text), text
-
-from langchain.schema import Document
-
-def run_openai_query(api_key, content, prompt):
-    llm = ChatOpenAI(model="gpt-3.5-turbo", openai_api_key=api_key)
-    chain = load_qa_chain(llm=llm, chain_type="stuff")
-
-    # Handle string or list input
-    if isinstance(content, str):
-        input_documents = [Document(page_content=content)]
-    else:
-        input_documents = [Document(page_content=chunk) for chunk in content[:5]]
-
-    return chain.run(input_documents=input_documents, question=prompt)
-
-
-def get_strength_score(api_key, chunks):
-    rubric_prompt = (
-        "You are a resume reviewer. Please rate the resume on a scale from 0 to 100 using the rubric below:\n\n"
-        "• 90-100: Outstanding resume — excellent technical skills, clear formatting, metrics-backed experience, highly relevant to target jobs.\n"
-        "• 75-89: Strong resume — good clarity, relevant skills and roles, some quantification, minor improvements needed.\n"
-        "• 60-74: Average — acceptable formatting and content but lacks metrics, specificity, or strong action verbs.\n"
-        "• 40-59: Weak — lacks structure, missing key sections, vague or generic experience.\n"
-        "• 0-39: Very poor — not a professional resume.\n\n"
-        "Based on this rubric, provide only a number between 0 and 100. Do not explain or include any other text."
-    )
-    try:
-        score_text = run_openai_query(api_key, chunks[:5], rubric_prompt)
-        score = int("".join(filter(str.isdigit, score_text.strip())))
-        return min(max(score, 0), 100)
-    except Exception:
-        return 70
-
-
-def display_score_gauge(score, summary_text, api_key):
-    if score >= 90:
-        label = "Excellent"
-        prompt = "In 2-3 sentences, explain why this resume is excellent without repeating the summary. Focus on technical skills, education, and experience."
-    elif score >= 75:
-        label = "Great"
-        prompt = "In 2-3 sentences, explain why this resume is great. Focus on technical skills, education, and core strengths only."
-    elif score >= 60:
-        label = "Good"
-        prompt = "Briefly explain why this resume is decent but can be improved, in a positive tone. Focus on education and technical skills."
-    else:
-        label = "Needs Improvement"
-        prompt = "Write 2-3 sentences on why this resume needs improvement, without repeating the summary."
-
-    try:
-        response = run_openai_query(api_key, [summary_text], prompt)
-    except:
-        response = "This resume can be improved by aligning more closely with job-specific skills and metrics."
+def display_score_gauge(score, summary_text, api_key, explanation=None):
+    label, _ = score_label_and_prompt(score)
+    if explanation is None:
+        explanation = get_score_explanation(api_key, score, summary_text)
+    import plotly.graph_objects as go
 
     # Create donut chart with dark theme
     fig = go.Figure(go.Pie(
@@ -125,58 +69,11 @@ def display_score_gauge(score, summary_text, api_key):
 
     with col2:
         st.markdown(f"<h2 style='margin-top:5px; color:white;'>{label}</h2>", unsafe_allow_html=True)
-        st.markdown(f"<div style='font-size:16px; color:#e0e0e0; line-height:1.5;'>{response}</div>", unsafe_allow_html=True)
-
-def get_resume_fixes(api_key, chunks):
-    prompt = (
-        "Analyze the resume and return a JSON list of exactly these 4 standard improvement categories: "
-        "Weak Verbs, Buzzwords, Filler Words, Consistency. "
-        "For each, provide: issue name, severity score (1-10), examples with suggestions. "
-        "For Weak Verbs: identify generic verbs that could be replaced with stronger action verbs. "
-        "For Buzzwords: identify overused industry jargon or trendy terms. "
-        "For Filler Words: identify unnecessary words that add no value. "
-        "For Consistency: identify any inconsistencies in formatting, tense, or style. "
-        "Format: [{\"issue\": \"Weak Verbs\", \"score\": 6, \"details\": [{\"word\": \"helped with\", \"suggestion\": \"Replace with 'spearheaded' or 'led'\"}]}]"
-    )
-    try:
-        raw = run_openai_query(api_key, chunks, prompt)
-        return json.loads(raw)
-    except Exception as e:
-        # Fallback data if parsing fails
-        return [
-            {
-                "issue": "Weak Verbs", 
-                "score": 7, 
-                "details": [
-                    {"word": "worked on", "suggestion": "Replace with 'developed', 'implemented', or 'executed'"},
-                    {"word": "helped with", "suggestion": "Replace with 'led', 'coordinated', or 'orchestrated'"}
-                ]
-            },
-            {
-                "issue": "Buzzwords", 
-                "score": 5, 
-                "details": [
-                    {"word": "synergy", "suggestion": "Replace with specific collaborative achievements"},
-                    {"word": "results-driven", "suggestion": "Include actual metrics and outcomes instead"}
-                ]
-            },
-            {
-                "issue": "Filler Words", 
-                "score": 4, 
-                "details": [
-                    {"word": "very", "suggestion": "Remove or replace with specific descriptors"},
-                    {"word": "in order to", "suggestion": "Replace with 'to' for conciseness"}
-                ]
-            },
-            {
-                "issue": "Consistency", 
-                "score": 6, 
-                "details": [
-                    {"word": "Mixed tenses", "suggestion": "Use past tense for previous roles and present for current roles"},
-                    {"word": "Inconsistent formatting", "suggestion": "Standardize bullet points, dates, and section headers"}
-                ]
-            }
-        ]
+        st.markdown(f"<div style='font-size:16px; color:#e0e0e0; line-height:1.5;'>{explanation}</div>", unsafe_allow_html=True)
+
+
+def show_section(text):
+    st.markdown(f'<div style="background-color:#2d2d2d; padding:15px; border-radius:8px;">{text}</div>', unsafe_allow_html=True)
 
 def display_top_fixes(fixes):
     st.markdown("## Top Fixes")
@@ -224,76 +121,158 @@ def display_top_fixes(fixes):
             else:
                 st.write("No specific examples detected.")
 
-# ---------------------- LinkedIn Scraper ----------------------
-def scrape_jobs(role, location, resume_summary, num_jobs=10):
-    from selenium.webdriver.common.action_chains import ActionChains
+    missing = [issue for issue in FIX_CATEGORIES if issue not in {fix["issue"] for fix in fixes}]
+    if missing:
+        st.caption("Not assessed: " + ", ".join(missing))
+
+# ---------------------- Background tasks ----------------------
+def show_task_status(task, label):
+    # Progress and a cancel button while the task is queued or running; the outcome otherwise
+    if task["status"] in FINISHED:
+        if task["status"] == "failed":
+            st.error(f"❌ {label} failed: {task['error']}")
+        elif task["status"] == "cancelled":
+            st.warning(f"{label} was cancelled.")
+        return
+    col1, col2 = st.columns([5, 1])
+    with col1:
+        text = task["message"] or ("Waiting for a free worker..." if task["status"] == "queued" else f"{label}...")
+        st.progress(min(max(task["progress"], 0.0), 1.0), text=text)
+    with col2:
+        st.button("Cancel", key=f"cancel-{task['id']}", disabled=task["cancel_requested"],
+                  on_click=get_task_queue().cancel, args=(task["id"],))
 
-    options = Options()
-    options.add_argument("--start-maximized")
-    options.add_experimental_option("detach", True)
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
 
-    st.session_state["driver"] = driver
-    driver.get("https://www.linkedin.com/login")
+@st.fragment(run_every=POLL_SECONDS)
+def poll_task(task_id, show):
+    # Re-renders just this part of the page until the task ends, then the whole page once
+    # more so the finished result is drawn without polling
+    task = get_task_queue().get(task_id)
+    show(task)
+    if task["status"] in FINISHED:
+        st.rerun()
 
-    st.warning("🔐 Please log into LinkedIn manually in the browser that just opened.")
-    st.info("⏳ Waiting for you to log in... Scraping will start once login is successful.")
 
-    while "login" in driver.current_url:
-        time.sleep(2)
+def show_task(task, show):
+    if task["status"] in FINISHED:
+        show(task)
+    else:
+        poll_task(task["id"], show)
 
-    query = f"https://www.linkedin.com/jobs/search/?keywords={role}&location={location}&sortBy=DD"
-    driver.get(query)
-    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-    time.sleep(5)
 
-    try:
-        WebDriverWait(driver, 60).until(
-            EC.presence_of_all_elements_located((By.CLASS_NAME, "job-card-container"))
+# ---------------------- Resume Analyzer ----------------------
+def show_resume(name, view, api_key):
+    # Create a container with custom styling
+    with st.container():
+        st.markdown(
+            f"""
+            <div style="background-color:#1e1e1e; padding:15px; border-radius:10px; margin-bottom:20px;">
+                <div style="display:flex; align-items:center;">
+                    <div style="margin-right:10px;">
+                        <svg width="24" height="24" viewBox="0 0 24 24" fill="none" xmlns="http://www.w3.org/2000/svg">
+                            <path d="M14 2H6C4.9 2 4 2.9 4 4V20C4 21.1 4.9 22 6 22H18C19.1 22 20 21.1 20 20V8L14 2Z" stroke="#00D1C1" stroke-width="2" stroke-miterlimit="10" stroke-linecap="round" stroke-linejoin="round"/>
+                            <path d="M14 2V8H20" stroke="#00D1C1" stroke-width="2" stroke-miterlimit="10" stroke-linecap="round" stroke-linejoin="round"/>
+                        </svg>
+                    </div>
+                    <h3 style="margin:0; color:white;">{name}</h3>
+                </div>
+            </div>
+            """,
+            unsafe_allow_html=True
         )
-        time.sleep(3)
-
-        job_cards = driver.find_elements(By.CLASS_NAME, "job-card-container")
-        jobs_to_scrape = min(num_jobs, len(job_cards))
-        jobs = []
-
-        for i, card in enumerate(job_cards[:jobs_to_scrape]):
-            try:
-                driver.execute_script("arguments[0].scrollIntoView();", card)
-                time.sleep(1)
-                ActionChains(driver).move_to_element(card).click().perform()
-                time.sleep(2)
-
-                # Extract URL from job card element
-                try:
-                    job_url = card.find_element(By.CSS_SELECTOR, "a").get_attribute("href")
-                except:
-                    job_url = "URL not found"
-
-                if "linkedin.com/jobs/view/" in job_url:
-                    jobs.append({"Job URL": job_url})
-                else:
-                    st.warning(f"Job {i+1} does not have a valid job view URL.")
-
-            except Exception as e:
-                st.error(f"❌ Error scraping job {i+1}: {e}")
-                with open(f"job_error_{i+1}.html", "w", encoding="utf-8") as f:
-                    f.write(driver.page_source)
-
-        df = pd.DataFrame(jobs)
-        if not df.empty:
-            st.success(f"✅ Scraped {len(df)} job URLs.")
-            st.dataframe(df)
-            st.download_button("⬇️ Download Job URLs as CSV", df.to_csv(index=False), file_name="linkedin_job_urls.csv", mime="text/csv")
-        else:
-            st.warning("❗No job data collected. Try again or verify LinkedIn loaded correctly.")
 
-        return df
+    # The gauge goes up as soon as the score is known; its explanation fills in after
+    if "score" in view:
+        display_score_gauge(view["score"], view.get("summary", ""), api_key, view.get("explanation", ""))
+    if "fixes" in view:
+        display_top_fixes(view["fixes"])
+
+    # Create collapsible sections for detailed analysis
+    for field, title in (("summary", "📝 Summary"), ("strengths", "💪 Strengths"),
+                         ("weaknesses", "⚠️ Weaknesses"), ("roles", "🎯 Job Role Suggestions")):
+        with st.expander(title, expanded=True):
+            if field in view:
+                show_section(view[field])
+
+
+def show_analysis(task):
+    show_task_status(task, "Analysis")
+    data = task["result"] or task["partial"] or {}
+    resumes = data.get("resumes", {})
+    # Sections still being written are shown as far as they have got
+    views = {name: {**data.get("streaming", {}).get(name, {}), **fields} for name, fields in resumes.items()}
+
+    # Sections whose request failed are left out rather than filled with a stand-in;
+    # answers that did arrive are cached, so analyzing again only resends the rest
+    for name, view in views.items():
+        for field, message in view.get("errors", {}).items():
+            st.error(f"`{name}` — could not get the {field}: {message}")
+
+    if task["status"] == "done" and views:
+        # Set the first resume as default for LinkedIn job matching
+        first = next(iter(views))
+        if "summary" in views[first]:
+            st.session_state["resume_summary"] = views[first]["summary"]
+            st.session_state["resume_text"] = task["result"]["texts"][first]
+
+    # Display single resume analysis
+    if len(views) == 1:
+        name, view = next(iter(views.items()))
+        show_resume(name, view, openai_api_key)
+
+    elif views and task["status"] != "done":
+        for name, view in views.items():
+            done_fields = ", ".join(f for f in ("summary", "strengths", "weaknesses", "roles", "score", "fixes") if f in resumes[name])
+            score_text = f" — score **{view['score']}**" if "score" in view else ""
+            st.markdown(f"`{name}`{score_text} · ready: {done_fields}")
+
+    # Display comparison for multiple resumes
+    elif views:
+        st.subheader("Resume Score Comparison")
+        scores = {name: view["score"] for name, view in views.items() if "score" in view}
+        st.bar_chart(scores)
+        
+        # Allow user to select which resume to view in detail
+        selected_resume = st.selectbox("Select resume to view details", list(views.keys()))
+        
+        if selected_resume:
+            selected = views[selected_resume]
+            if "score" in selected:
+                display_score_gauge(selected["score"], selected.get("summary", ""), openai_api_key,
+                                    selected.get("explanation", ""))
+            if "fixes" in selected:
+                display_top_fixes(selected["fixes"])
+            
+            st.write("### 📝 Summary")
+            st.write(selected.get("summary", "—"))
+            st.write("### 💪 Strengths")
+            st.write(selected.get("strengths", "—"))
+            st.write("### ⚠️ Weaknesses")
+            st.write(selected.get("weaknesses", "—"))
+            st.write("### 🎯 Job Role Suggestions")
+            st.write(selected.get("roles", "—"))
 
-    finally:
-        if "driver" in st.session_state:
-            del st.session_state["driver"]
-            driver.quit()
+
+# ---------------------- LinkedIn Scraper ----------------------
+def show_job_search(task):
+    show_task_status(task, "Job search")
+    if task["status"] != "done":
+        return
+    import pandas as pd
+
+    result = task["result"]
+    for level, text in result["notices"]:
+        getattr(st, level)(text)
+    df = pd.DataFrame(result["jobs"])
+    if not df.empty:
+        df = df.sort_values("Relevance", ascending=False, ignore_index=True)
+        st.success(f"✅ {len(df)} job URLs ({result['new']} new since the last search).")
+        st.dataframe(df)
+        st.download_button("⬇️ Download Job URLs as CSV", df.to_csv(index=False), file_name="linkedin_job_urls.csv", mime="text/csv")
+        st.session_state["jobs_df"] = df
+    else:
+        st.warning("❗No job data collected. Try again or verify LinkedIn loaded correctly.")
+        st.warning("No matching jobs found. Try changing the title or location.")
 
 # ---------------------- Streamlit UI ----------------------
 st.set_page_config(page_title="Resume & LinkedIn Analyzer", layout="wide")
@@ -352,116 +331,94 @@ st.title("📄 AI Resume Analyzer + 💼 LinkedIn Job Scraper")
 
 tabs = st.tabs(["Resume Analyzer", "LinkedIn Jobs"])
 
-# Initialize a dictionary to store resume versions
-resume_versions = {}
+# Tasks belong to this browser tab; the id is kept in the URL so a refresh finds them again
+if "session" not in st.query_params:
+    st.query_params["session"] = uuid.uuid4().hex
+owner = st.query_params["session"]
+task_queue = get_task_queue()
 
 # Resume Analyzer Tab
 with tabs[0]:
     st.subheader("Resume Analysis")
     openai_api_key = "Your API Key"
+    max_concurrency = st.sidebar.slider("Max concurrent LLM requests", 1, 16, MAX_CONCURRENCY)
+    analysis_mode = st.sidebar.radio(
+        "Analysis mode", ["structured", "per-prompt"], index=0 if ANALYSIS_MODE == "structured" else 1,
+        help="'structured' sends the resume once and asks for every section as one JSON document."
+    )
+    fixes_engine = st.sidebar.radio(
+        "Top fixes", FIXES_ENGINES, index=FIXES_ENGINES.index(FIXES_ENGINE),
+        help="'local' finds weak verbs, buzzwords, filler and inconsistencies without an LLM call; "
+             "'local+llm' adds the model's examples."
+    )
+    stream_responses = st.sidebar.checkbox("Stream responses", value=True,
+                                           help="Fill in each section as the model writes it.")
     uploaded_files = st.file_uploader("📤 Upload your Resume (PDF or DOCX)", type=["pdf", "docx"], accept_multiple_files=True)
 
     if uploaded_files and openai_api_key:
-        for file in uploaded_files:
-            chunks, full_text = resume_to_chunks(file)
-            with st.spinner(f"Analyzing {file.name}..."):
-                summary = run_openai_query(openai_api_key, chunks, "Summarize this resume.")
-                strengths = run_openai_query(openai_api_key, chunks, "What are the strengths in this resume?")
-                score = get_strength_score(openai_api_key, chunks)
-                weaknesses = run_openai_query(openai_api_key, chunks, "What are the weaknesses in this resume?")
-                roles = run_openai_query(openai_api_key, chunks, "Based on this resume, what job roles are suitable?")
-                
-                resume_versions[file.name] = {
-                    "score": score, 
-                    "summary": summary, 
-                    "chunks": chunks, 
-                    "strengths": strengths,
-                    "weaknesses": weaknesses,
-                    "roles": roles
-                }
-                
-        # Set the first resume as default for LinkedIn job matching
-        if uploaded_files:
-            first_file = uploaded_files[0]
-            st.session_state["resume_summary"] = resume_versions[first_file.name]["summary"]
-        
-                    # Display single resume analysis
-        if len(uploaded_files) == 1:
-            file = uploaded_files[0]
-            
-            # Create a container with custom styling
-            with st.container():
-                st.markdown(
-                    f"""
-                    <div style="background-color:#1e1e1e; padding:15px; border-radius:10px; margin-bottom:20px;">
-                        <div style="display:flex; align-items:center;">
-                            <div style="margin-right:10px;">
-                                <svg width="24" height="24" viewBox="0 0 24 24" fill="none" xmlns="http://www.w3.org/2000/svg">
-                                    <path d="M14 2H6C4.9 2 4 2.9 4 4V20C4 21.1 4.9 22 6 22H18C19.1 22 20 21.1 20 20V8L14 2Z" stroke="#00D1C1" stroke-width="2" stroke-miterlimit="10" stroke-linecap="round" stroke-linejoin="round"/>
-                                    <path d="M14 2V8H20" stroke="#00D1C1" stroke-width="2" stroke-miterlimit="10" stroke-linecap="round" stroke-linejoin="round"/>
-                                </svg>
-                            </div>
-                            <h3 style="margin:0; color:white;">{file.name}</h3>
-                        </div>
-                    </div>
-                    """, 
-                    unsafe_allow_html=True
-                )
-            
-            # Display score gauge
-            display_score_gauge(resume_versions[file.name]["score"], resume_versions[file.name]["summary"], openai_api_key)
-            
-            # Display top fixes
-            display_top_fixes(get_resume_fixes(openai_api_key, resume_versions[file.name]["chunks"]))
-            
-            # Create collapsible sections for detailed analysis
-            with st.expander("📝 Summary", expanded=False):
-                st.markdown(f'<div style="background-color:#2d2d2d; padding:15px; border-radius:8px;">{resume_versions[file.name]["summary"]}</div>', unsafe_allow_html=True)
-                
-            with st.expander("💪 Strengths", expanded=False):
-                st.markdown(f'<div style="background-color:#2d2d2d; padding:15px; border-radius:8px;">{resume_versions[file.name]["strengths"]}</div>', unsafe_allow_html=True)
-                
-            with st.expander("⚠️ Weaknesses", expanded=False):
-                st.markdown(f'<div style="background-color:#2d2d2d; padding:15px; border-radius:8px;">{resume_versions[file.name]["weaknesses"]}</div>', unsafe_allow_html=True)
-                
-            with st.expander("🎯 Job Role Suggestions", expanded=False):
-                st.markdown(f'<div style="background-color:#2d2d2d; padding:15px; border-radius:8px;">{resume_versions[file.name]["roles"]}</div>', unsafe_allow_html=True)
-            
-        # Display comparison for multiple resumes
-        elif len(uploaded_files) > 1:
-            st.subheader("Resume Score Comparison")
-            scores = {name: resume_versions[name]["score"] for name in resume_versions}
-            st.bar_chart(scores)
-            
-            # Allow user to select which resume to view in detail
-            selected_resume = st.selectbox("Select resume to view details", list(resume_versions.keys()))
-            
-            if selected_resume:
-                display_score_gauge(resume_versions[selected_resume]["score"], resume_versions[selected_resume]["summary"], openai_api_key)
-                display_top_fixes(get_resume_fixes(openai_api_key, resume_versions[selected_resume]["chunks"]))
-                
-                st.write("### 📝 Summary")
-                st.write(resume_versions[selected_resume]["summary"])
-                st.write("### 💪 Strengths")
-                st.write(resume_versions[selected_resume]["strengths"])
-                st.write("### ⚠️ Weaknesses")
-                st.write(resume_versions[selected_resume]["weaknesses"])
-                st.write("### 🎯 Job Role Suggestions")
-                st.write(resume_versions[selected_resume]["roles"])
+        files = [(file.name, file.getvalue()) for file in uploaded_files]
+        params = {"mode": analysis_mode, "fixes": fixes_engine, "stream": stream_responses,
+                  "max_concurrency": max_concurrency}
+        key = content_hash(params, [name for name, _ in files], *(data for _, data in files))
+        # Reruns (widget changes, polling, a refresh) keep showing the same task rather than starting another
+        latest = task_queue.latest(owner, "analysis")
+        if latest is None or latest["key"] != key or (
+            latest["status"] in ("failed", "cancelled") and st.button("🔁 Analyze again")
+        ):
+            st.session_state["analysis_task"] = task_queue.submit(
+                "analysis", params, owner, files, secrets={"api_key": openai_api_key}, key=key
+            )
+        else:
+            st.session_state["analysis_task"] = latest["id"]
+
+    elif "analysis_task" not in st.session_state:
+        # After a refresh the uploads are gone, but the last analysis is still shown
+        latest = task_queue.latest(owner, "analysis")
+        if latest is not None:
+            st.session_state["analysis_task"] = latest["id"]
+
+    analysis_task = task_queue.get(st.session_state["analysis_task"]) if "analysis_task" in st.session_state else None
+    if analysis_task is not None:
+        show_task(analysis_task, show_analysis)
 
 # LinkedIn Jobs Tab
 with tabs[1]:
     st.subheader("Search LinkedIn Jobs")
     job_title = st.text_input("Enter Job Title", "Data Scientist")
     job_location = st.selectbox("Select Job Location", countries)
+    num_jobs = st.number_input("Number of jobs", min_value=1, max_value=500, value=25, step=25)
+    with st.expander("Matching options"):
+        match_method = st.radio("Rank jobs by", ["tfidf", "embedding"], horizontal=True,
+                                help="'tfidf' runs locally; 'embedding' embeds each job once and caches it.")
+        fetch_descriptions = st.checkbox("Fetch full job descriptions (opens each new job once)")
+        rerank_top_n = st.slider("Re-rank the top N jobs with the LLM", 0, 25, 0)
 
     if st.button("Search Jobs"):
         if "resume_summary" not in st.session_state:
             st.error("Please analyze a resume first to use it for matching.")
         else:
-            with st.spinner("Opening LinkedIn... Please log in manually."):
-                df = scrape_jobs(job_title, job_location, st.session_state["resume_summary"], 25)
-                if df.empty:
-                    st.warning("No matching jobs found. Try changing the title or location.")
-                else:
-                    st.session_state["jobs_df"] = df
+            st.session_state["search_task"] = task_queue.submit(
+                "job_search",
+                {"role": job_title, "location": job_location, "resume_summary": st.session_state["resume_summary"],
+                 "num_jobs": int(num_jobs), "resume_text": st.session_state.get("resume_text", ""),
+                 "match_method": match_method, "fetch_descriptions": fetch_descriptions,
+                 "rerank_top_n": rerank_top_n},
+                owner, secrets={"api_key": openai_api_key},
+            )
+    elif "search_task" not in st.session_state:
+        latest = task_queue.latest(owner, "job_search")
+        if latest is not None:
+            st.session_state["search_task"] = latest["id"]
+
+    search_task = task_queue.get(st.session_state["search_task"]) if "search_task" in st.session_state else None
+    if search_task is not None:
+        show_task(search_task, show_job_search)
+
+# Rendered last so it includes this run's timings
+if st.sidebar.checkbox("Show performance telemetry"):
+    telemetry = get_telemetry()
+    st.sidebar.dataframe(telemetry.summary(), hide_index=True)
+    st.sidebar.download_button("Download spans (JSONL)", telemetry.to_jsonl(), "telemetry.jsonl")
+    st.sidebar.download_button("Download metrics (Prometheus)", telemetry.to_prometheus(), "metrics.prom")
+    if TELEMETRY_ADMIN and st.sidebar.button("Reset telemetry"):
+        telemetry.clear()
@@ -0,0 +1,116 @@
+import os
+
+from job_store import get_job_store
+from llm_scheduler import BATCH, INTERACTIVE
+from resume_analysis import ANALYSIS_PROMPTS, MAX_CONCURRENCY, analyze_resumes, documents_to_chunks
+from task_queue import register_handler
+
+# The app's long-running work, run by task_queue workers: analyzing uploaded resumes
+# and searching LinkedIn. Both report progress and partial results as they go (which
+# is also where a cancelled task stops) and never touch Streamlit. With context=None
+# they simply run to completion on the calling thread.
+
+# Uploads of at least this many resumes run at batch priority, so their LLM requests wait
+# behind those of sessions analyzing a single resume
+BATCH_UPLOAD_FILES = int(os.environ.get("RESUME_ANALYZER_BATCH_UPLOAD_FILES", "3"))
+
+
+def _reporter(context):
+    return context.report if context is not None else lambda *args, **kwargs: None
+
+
+def analyze_uploads(files, mode, fixes, stream=True, max_concurrency=MAX_CONCURRENCY, api_key=None, context=None):
+    # Partial results are {"resumes": {name: {field: value}}, "streaming": {name: {field: text so far}}};
+    # the result adds each resume's extracted text under "texts".
+    report = _reporter(context)
+    api_key = api_key or os.environ.get("OPENAI_API_KEY")
+    resumes, texts, results, streaming = {}, {}, {}, {}
+    report(0.0, f"Reading {len(files)} resume(s)...", {"resumes": {name: {} for name, _ in files}})
+    for (name, _), (chunks, text) in zip(files, documents_to_chunks(files)):
+        resumes[name], texts[name], results[name], streaming[name] = chunks, text, {}, {}
+
+    total_calls = len(resumes) * (len(ANALYSIS_PROMPTS) + 3)  # prompts + score, fixes, explanation
+    completed = 0
+    report(message=f"Analyzing {len(resumes)} resume(s)... 0/{total_calls}")
+
+    def on_partial(name, field, value):
+        streaming[name][field] = value
+        report(partial={"resumes": results, "streaming": streaming})
+
+    priority = BATCH if len(resumes) >= BATCH_UPLOAD_FILES else INTERACTIVE
+    for name, field, value in analyze_resumes(api_key, resumes, max_concurrency, mode,
+                                              on_partial=on_partial if stream else None, texts=texts, fixes=fixes,
+                                              priority=priority, on_poll=context.check if context is not None else None):
+        results[name][field] = value
+        streaming[name].pop(field, None)
+        completed += 1
+        report(min(completed / total_calls, 1.0), f"Analyzing {len(resumes)} resume(s)... {completed}/{total_calls}",
+               {"resumes": results, "streaming": streaming})
+    return {"resumes": results, "texts": texts}
+
+
+def search_jobs(role, location, resume_summary, num_jobs=10, resume_text="", match_method="tfidf",
+                fetch_descriptions=False, rerank_top_n=0, api_key=None, context=None):
+    # Returns the ranked jobs as table rows, how many are new, and (level, text) notices for the page
+    from job_matching import rank_jobs
+
+    report = _reporter(context)
+    store = get_job_store()
+    notices = []
+    new_ids = set()
+    fresh = store.is_fresh(role, location, num_jobs)
+    needs_descriptions = fetch_descriptions and (
+        not fresh or any(not job["description"] for job in store.recent_jobs(role, location, num_jobs))
+    )
+
+    if fresh and not needs_descriptions:
+        notices.append(("info", "⚡ Served from the local job index (searched recently)."))
+    else:
+        from selenium.common.exceptions import TimeoutException
+
+        from linkedin_scraper import collect_new_jobs, ensure_logged_in, fetch_job_descriptions, get_driver_pool
+
+        pool = get_driver_pool()
+        report(0.0, "Waiting for a browser...")
+        with pool.driver(on_poll=context.check if context is not None else None) as driver:
+            report(message="Opening LinkedIn...")
+            ensure_logged_in(
+                pool, driver,
+                lambda: report(message="🔐 Please log into LinkedIn manually in the browser that just opened. "
+                                       "Scraping will start once login is successful."),
+                on_poll=context.check if context is not None else None,
+            )
+            if not fresh:
+                try:
+                    new_jobs = collect_new_jobs(
+                        driver, role, location, num_jobs, store.known_ids(role, location),
+                        lambda page, found: report(min(found / num_jobs, 1.0), f"Page {page}: {found} new jobs"),
+                    )
+                except TimeoutException:
+                    notices.append(("error", "❌ Job results did not load in time."))
+                    with open("job_error.html", "w", encoding="utf-8") as f:
+                        f.write(driver.page_source)
+                    new_jobs = []
+                store.add_jobs(role, location, new_jobs)
+                new_ids = {job["job_id"] for job in new_jobs}
+            if fetch_descriptions:
+                missing = [job for job in store.recent_jobs(role, location, num_jobs) if not job["description"]]
+                store.set_descriptions(fetch_job_descriptions(
+                    driver, missing,
+                    on_progress=lambda done: report(message=f"Fetching job descriptions... {done}/{len(missing)}"),
+                ))
+
+    report(message="Ranking jobs...")
+    jobs = store.recent_jobs(role, location, num_jobs)
+    scores = rank_jobs(
+        f"{resume_summary}\n{resume_text}", jobs, match_method, api_key, rerank_top_n, resume_summary
+    )
+    rows = [
+        {"Job URL": job["url"], "Title": job["title"], "Relevance": round(float(score), 3), "New": job["job_id"] in new_ids}
+        for job, score in zip(jobs, scores)
+    ]
+    return {"jobs": rows, "new": len(new_ids), "notices": notices}
+
+
+register_handler("analysis", lambda context, **params: analyze_uploads(context.files(), context=context, **params))
+register_handler("job_search", lambda context, **params: search_jobs(context=context, **params))
@@ -0,0 +1,64 @@
+"""Per-call overhead of building a ChatOpenAI + chain for every prompt versus the pooled registry.
+
+Runs against a local stub endpoint, so it measures client construction and connection setup only:
+
+    python -m benchmarks.bench_llm_client --calls 50
+"""
+import argparse
+import os
+import statistics
+import time
+
+from langchain.chains.question_answering import load_qa_chain
+from langchain.schema import Document
+from langchain_community.chat_models import ChatOpenAI
+
+from benchmarks.fake_openai import FakeOpenAIServer
+from llm_client import LLMClientRegistry
+
+
+def _time_calls(calls, get_chain):
+    documents = [Document(page_content="Experienced data scientist with Python and SQL.")]
+    timings = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        get_chain().run(input_documents=documents, question="Summarize this resume.")
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _report(label, timings, connections):
+    print(
+        f"{label:<10} mean {statistics.mean(timings) * 1000:7.2f} ms"
+        f"  p50 {statistics.median(timings) * 1000:7.2f} ms"
+        f"  max {max(timings) * 1000:7.2f} ms"
+        f"  connections {connections}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=50)
+    args = parser.parse_args()
+
+    with FakeOpenAIServer() as server:
+        os.environ["OPENAI_API_BASE"] = server.base_url
+
+        def per_call_chain():
+            llm = ChatOpenAI(model="gpt-3.5-turbo", openai_api_key="bench")
+            return load_qa_chain(llm=llm, chain_type="stuff")
+
+        _time_calls(1, per_call_chain)  # warm imports
+        before = server.stats["connections"]
+        _report("per-call", _time_calls(args.calls, per_call_chain), server.stats["connections"] - before)
+
+        registry = LLMClientRegistry()
+        _time_calls(1, lambda: registry.get_chain("bench", "gpt-3.5-turbo"))
+        before = server.stats["connections"]
+        _report("pooled", _time_calls(args.calls, lambda: registry.get_chain("bench", "gpt-3.5-turbo")),
+                server.stats["connections"] - before)
+        registry.close()
+
+
+if __name__ == "__main__":
+    main()
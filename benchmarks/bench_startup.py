@@ -0,0 +1,90 @@
+"""Cold-start time of the Streamlit app, checked against a budget.
+
+Each sample runs in a fresh interpreter, so nothing is already imported:
+
+    python -m benchmarks.bench_startup --runs 5 --budget-ms 1500
+
+It reports the time to import each top-level module on its own, and the time for
+the app's first render with no uploads (Streamlit's AppTest runs the script once,
+as a new session would). It also lists which heavy libraries that first render
+loaded. Exits with 1 when the median first render is over budget.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(REPO_DIR, "ResumeAnalyzer+Linked Scraper.py")
+MODULES = ("resume_analysis", "linkedin_scraper", "job_matching", "bulk_analyze")
+HEAVY_MODULES = ("selenium", "webdriver_manager", "langchain", "langchain_community", "openai", "pandas")
+
+IMPORT_SNIPPET = """
+import time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+"""
+
+RENDER_SNIPPET = """
+import json, logging, sys, time, warnings
+warnings.filterwarnings("ignore")
+from streamlit.testing.v1 import AppTest
+logging.getLogger("streamlit").setLevel(logging.ERROR)
+start = time.perf_counter()
+app = AppTest.from_file({app_path!r}, default_timeout=120)
+app.run()
+seconds = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": seconds,
+    "errors": [str(e.value) for e in app.exception],
+    "loaded": [name for name in {heavy!r} if name in sys.modules],
+}}))
+"""
+
+
+def _run(snippet):
+    result = subprocess.run(
+        [sys.executable, "-c", snippet], cwd=REPO_DIR, capture_output=True, text=True, check=True,
+        env={**os.environ, "PYTHONPATH": REPO_DIR},
+    )
+    return result.stdout.strip().splitlines()[-1]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1500, help="allowed median time to first render")
+    parser.add_argument("--output", help="also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    results = {"imports_ms": {}, "first_render_ms": None, "heavy_modules_loaded": []}
+    for module in MODULES:
+        samples = [float(_run(IMPORT_SNIPPET.format(module=module))) * 1000 for _ in range(args.runs)]
+        results["imports_ms"][module] = round(statistics.median(samples), 1)
+        print(f"import {module:<28} {results['imports_ms'][module]:>8.1f} ms")
+
+    renders = [json.loads(_run(RENDER_SNIPPET.format(app_path=APP_PATH, heavy=HEAVY_MODULES)))
+               for _ in range(args.runs)]
+    errors = [error for render in renders for error in render["errors"]]
+    results["first_render_ms"] = round(statistics.median(render["seconds"] for render in renders) * 1000, 1)
+    results["heavy_modules_loaded"] = sorted({name for render in renders for name in render["loaded"]})
+    print(f"{'first render':<35} {results['first_render_ms']:>8.1f} ms (budget {args.budget_ms:.0f} ms)")
+    print(f"heavy modules loaded by first render: {', '.join(results['heavy_modules_loaded']) or 'none'}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if errors:
+        print(f"First render raised: {errors[0]}")
+        return 1
+    if results["first_render_ms"] > args.budget_ms:
+        print(f"First render is over budget by {results['first_render_ms'] - args.budget_ms:.0f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+import io
+import random
+
+from docx import Document as DocxWriter
+
+# Synthetic resumes for benchmarks. PDFs are written directly (one Helvetica text
+# object per page) so no PDF authoring library is needed.
+SECTIONS = ["Summary", "Experience", "Projects", "Skills", "Education", "Certifications"]
+VERBS = ["Developed", "Led", "Worked on", "Helped with", "Built", "Designed", "Responsible for", "Improved"]
+OBJECTS = ["a data pipeline", "the reporting dashboard", "an ML model", "the billing service",
+           "customer churn analysis", "a recommendation engine", "CI/CD automation", "the data warehouse"]
+TOOLS = ["Python", "SQL", "Spark", "AWS", "Docker", "Kubernetes", "pandas", "Airflow", "Tableau", "React"]
+OUTCOMES = ["reducing latency by {n}%", "saving ${n}k per year", "for {n} internal users",
+            "very successfully", "in order to drive synergy", "improving accuracy by {n}%"]
+
+LINES_PER_PAGE = 48
+
+
+def resume_lines(pages, seed):
+    rng = random.Random(seed)
+    lines = [f"Candidate {seed}", "candidate@example.com | +1 555 0100"]
+    while len(lines) < pages * LINES_PER_PAGE:
+        lines.append(rng.choice(SECTIONS))
+        lines.append(f"{rng.choice(['Senior', 'Lead', ''])} Data Scientist, Company {rng.randint(1, 99)} "
+                     f"{rng.randint(2012, 2020)} - {rng.randint(2021, 2025)}".strip())
+        for _ in range(rng.randint(4, 8)):
+            outcome = rng.choice(OUTCOMES).format(n=rng.randint(5, 90))
+            lines.append(f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(TOOLS)} {outcome}.")
+    return lines[:pages * LINES_PER_PAGE]
+
+
+def _pdf_escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(lines):
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)] or [[]]
+    out = io.BytesIO()
+    offsets = []
+
+    def add(body):
+        offsets.append(out.tell())
+        out.write(f"{len(offsets)} 0 obj\n".encode() + body + b"\nendobj\n")
+
+    out.write(b"%PDF-1.4\n")
+    add(b"<< /Type /Catalog /Pages 2 0 R >>")
+    kids = " ".join(f"{4 + 2 * i} 0 R" for i in range(len(pages)))
+    add(f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>".encode())
+    add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    for i, page in enumerate(pages):
+        add(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 3 0 R >> >>"
+            f" /Contents {5 + 2 * i} 0 R >>".encode())
+        stream = "BT /F1 10 Tf 40 760 Td 15 TL " + " ".join(f"({_pdf_escape(line)}) '" for line in page) + " ET"
+        add(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream".encode("latin-1"))
+    xref = out.tell()
+    out.write(f"xref\n0 {len(offsets) + 1}\n0000000000 65535 f \n".encode())
+    out.write(b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets))
+    out.write(f"trailer\n<< /Size {len(offsets) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return out.getvalue()
+
+
+def make_docx(lines):
+    doc = DocxWriter()
+    for line in lines:
+        doc.add_paragraph(line)
+    out = io.BytesIO()
+    doc.save(out)
+    return out.getvalue()
+
+
+def build_corpus(sizes=(1, 2, 5, 10), per_size=3, seed=0):
+    # Returns [(file name, bytes)] alternating PDF and DOCX across sizes (in pages)
+    documents = []
+    for pages in sizes:
+        for i in range(per_size):
+            doc_seed = seed * 10000 + pages * 100 + i
+            lines = resume_lines(pages, doc_seed)
+            if i % 2 == 0:
+                documents.append((f"resume_{pages}p_{i}.pdf", make_pdf(lines)))
+            else:
+                documents.append((f"resume_{pages}p_{i}.docx", make_docx(lines)))
+    return documents
@@ -0,0 +1,116 @@
+import html
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "linkedin")
+SESSION_COOKIE = "li_at=bench-session"
+
+TITLES = ["Data Scientist", "Machine Learning Engineer", "Data Analyst", "Backend Engineer",
+          "Product Analyst", "Research Scientist", "Analytics Engineer", "Software Engineer"]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises"]
+SKILLS = ["Python", "SQL", "Spark", "AWS", "Kubernetes", "statistics", "pandas", "Tableau", "Java", "React"]
+
+
+def _fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def _logged_in(self):
+        return SESSION_COOKIE in (self.headers.get("Cookie") or "")
+
+    def _send(self, status, body="", headers=()):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in headers:
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _redirect(self, location, headers=()):
+        self._send(302, "", [("Location", location), *headers])
+
+    def do_POST(self):
+        if self.path.startswith("/login"):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            self._redirect("/feed/", [("Set-Cookie", SESSION_COOKIE + "; Path=/")])
+        else:
+            self._send(404)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        time.sleep(self.server.page_latency)
+        if url.path.startswith("/login"):
+            self._send(200, self.server.login_page)
+        elif not self._logged_in():
+            self._redirect("/login")
+        elif url.path.startswith("/feed"):
+            self._send(200, self.server.feed_page)
+        elif url.path.startswith("/jobs/search"):
+            self._send(200, self._search_page(parse_qs(url.query)))
+        elif url.path.startswith("/jobs/view/"):
+            self._send(200, self._job_page(url.path.rstrip("/").rsplit("/", 1)[-1]))
+        else:
+            self._send(404)
+
+    def _search_page(self, query):
+        start = int(query.get("start", ["0"])[0])
+        count = max(0, min(self.server.page_size, self.server.total_jobs - start))
+        cards = []
+        for i in range(start, start + count):
+            job_id = self.server.newest_job_id - i
+            rng = random.Random(job_id)
+            cards.append(self.server.card.format(
+                job_id=job_id,
+                title=html.escape(rng.choice(TITLES)),
+                company=html.escape(rng.choice(COMPANIES)),
+                location=html.escape(query.get("location", [""])[0]),
+            ))
+        return self.server.search_page.format(keywords=html.escape(query.get("keywords", [""])[0]), cards="\n".join(cards))
+
+    def _job_page(self, job_id):
+        rng = random.Random(int(job_id) if job_id.isdigit() else 0)
+        description = " ".join(f"Experience with {skill} is required." for skill in rng.sample(SKILLS, 4))
+        return self.server.job_view.format(title=html.escape(rng.choice(TITLES)), description=description)
+
+
+class FakeLinkedInServer:
+    # Serves the static fixtures with LinkedIn's URL layout: /feed/ and /jobs/* redirect to
+    # /login until the login form is posted, search pages honour &start= paging, and job
+    # IDs count down from newest_job_id so results look date-sorted.
+    def __init__(self, total_jobs=100, page_size=25, page_latency=0.0, newest_job_id=4000000000, port=0):
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        self._server.daemon_threads = True
+        self._server.total_jobs = total_jobs
+        self._server.page_size = page_size
+        self._server.page_latency = page_latency
+        self._server.newest_job_id = newest_job_id
+        self._server.login_page = _fixture("login.html")
+        self._server.feed_page = _fixture("feed.html")
+        self._server.search_page = _fixture("search.html")
+        self._server.card = _fixture("card.html")
+        self._server.job_view = _fixture("job_view.html")
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
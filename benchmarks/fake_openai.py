@@ -0,0 +1,212 @@
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+EMBEDDING_DIMENSIONS = 256
+
+# Canned answers picked by what the prompt asks for, so the app's parsers see realistic shapes
+STRUCTURED_REPLY = json.dumps({
+    "summary": "Data scientist with five years of experience building ML pipelines in Python and SQL.",
+    "strengths": ["Strong Python and SQL", "Production ML experience", "Quantified achievements"],
+    "weaknesses": ["Few leadership examples", "Skills section is long and unprioritized"],
+    "roles": ["Data Scientist", "Machine Learning Engineer", "Analytics Engineer"],
+    "score": 78,
+    "fixes": [
+        {"issue": "Weak Verbs", "score": 6, "details": [{"word": "worked on", "suggestion": "Use 'built'"}]},
+        {"issue": "Buzzwords", "score": 4, "details": [{"word": "synergy", "suggestion": "Describe the outcome"}]},
+        {"issue": "Filler Words", "score": 3, "details": [{"word": "very", "suggestion": "Remove"}]},
+        {"issue": "Consistency", "score": 5, "details": [{"word": "Mixed tenses", "suggestion": "Use past tense"}]},
+    ],
+})
+FIXES_REPLY = json.dumps(json.loads(STRUCTURED_REPLY)["fixes"])
+
+
+def _reply_for(prompt):
+    if "single JSON object" in prompt:
+        return STRUCTURED_REPLY
+    if "JSON list of exactly these 4" in prompt:
+        return FIXES_REPLY
+    if "provide only a number" in prompt:
+        return "78"
+    if "JSON list of numbers" in prompt:
+        return json.dumps([90 - i for i in range(prompt.count("\n"))])
+    return "The candidate has solid technical depth and relevant experience. " * 4
+
+
+def _count_tokens(text):
+    # Close enough to tiktoken for cost accounting in benchmarks (~4 characters per token)
+    return max(1, len(text) // 4)
+
+
+def _embedding(text):
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:4], "little")
+    return np.random.default_rng(seed).standard_normal(EMBEDDING_DIMENSIONS).astype(float).tolist()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        with self.server.stats_lock:
+            self.server.stats["connections"] += 1
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        server = self.server
+        retry_after = self._over_rate_limit()
+        if retry_after is not None:
+            self._reject(retry_after)
+            return
+        time.sleep(max(0.0, random.gauss(server.latency, server.latency_jitter)))
+        if self.path.endswith("/embeddings"):
+            payload, usage = self._embeddings(body)
+        else:
+            payload, usage = self._chat(body)
+        if body.get("stream"):
+            self._stream(payload, usage)
+            return
+        self._record(usage)
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _over_rate_limit(self):
+        # Seconds until a slot frees up when requests_per_minute were already sent in the last minute
+        server = self.server
+        if not server.requests_per_minute:
+            return None
+        with server.stats_lock:
+            now = time.monotonic()
+            while server.recent and server.recent[0] <= now - 60:
+                server.recent.popleft()
+            if len(server.recent) >= server.requests_per_minute:
+                server.stats["rate_limited"] += 1
+                return server.recent[0] + 60 - now
+            server.recent.append(now)
+        return None
+
+    def _reject(self, retry_after):
+        data = json.dumps({"error": {"message": "Rate limit reached for requests", "type": "requests",
+                                     "code": "rate_limit_exceeded"}}).encode("utf-8")
+        self.send_response(429)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("retry-after-ms", str(int(retry_after * 1000)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _record(self, usage):
+        server = self.server
+        with server.stats_lock:
+            server.stats["requests"] += 1
+            server.stats["prompt_tokens"] += usage.get("prompt_tokens", 0)
+            server.stats["completion_tokens"] += usage.get("completion_tokens", 0)
+
+    def _stream(self, payload, usage):
+        # Server-sent events, one word per chunk, token_latency apart
+        self._record(usage)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        reply = payload["choices"][0]["message"]["content"]
+        pieces = re.findall(r"\S+\s*|\s+", reply)
+        for i, piece in enumerate(pieces):
+            chunk = {
+                "id": payload["id"],
+                "object": "chat.completion.chunk",
+                "created": payload["created"],
+                "model": payload["model"],
+                "choices": [{"index": 0, "delta": {"role": "assistant", "content": piece} if i == 0 else {"content": piece},
+                             "finish_reason": "stop" if i == len(pieces) - 1 else None}],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+            time.sleep(self.server.token_latency)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def _chat(self, body):
+        prompt = "\n".join(str(message.get("content", "")) for message in body.get("messages", []))
+        reply = self.server.reply or _reply_for(prompt)
+        completion_tokens = self.server.completion_tokens or _count_tokens(reply)
+        usage = {
+            "prompt_tokens": _count_tokens(prompt),
+            "completion_tokens": completion_tokens,
+            "total_tokens": _count_tokens(prompt) + completion_tokens,
+        }
+        return {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": reply}, "finish_reason": "stop"}],
+            "usage": usage,
+        }, usage
+
+    def _embeddings(self, body):
+        texts = body.get("input", [])
+        texts = texts if isinstance(texts, list) else [texts]
+        tokens = sum(_count_tokens(str(text)) for text in texts)
+        usage = {"prompt_tokens": tokens, "total_tokens": tokens}
+        return {
+            "object": "list",
+            "data": [{"object": "embedding", "index": i, "embedding": _embedding(str(text))} for i, text in enumerate(texts)],
+            "model": body.get("model", "fake"),
+            "usage": usage,
+        }, usage
+
+
+class FakeOpenAIServer:
+    # OpenAI-compatible chat and embeddings endpoint on localhost for benchmarks; point
+    # OPENAI_API_BASE at base_url. Latency is per request (gaussian with latency_jitter).
+    # completion_tokens fixes the reported completion size, otherwise it follows the reply.
+    # Streamed replies (stream=true) arrive one word every token_latency seconds. With
+    # requests_per_minute, requests over that rate get a 429 with retry-after-ms, like OpenAI.
+    def __init__(self, latency=0.0, latency_jitter=0.0, reply=None, completion_tokens=None, port=0,
+                 token_latency=0.0, requests_per_minute=None):
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        self._server.daemon_threads = True
+        self._server.latency = latency
+        self._server.latency_jitter = latency_jitter
+        self._server.reply = reply
+        self._server.completion_tokens = completion_tokens
+        self._server.token_latency = token_latency
+        self._server.requests_per_minute = requests_per_minute
+        self._server.recent = deque()
+        self._server.stats = {"connections": 0, "requests": 0, "prompt_tokens": 0, "completion_tokens": 0,
+                              "rate_limited": 0}
+        self._server.stats_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    @property
+    def stats(self):
+        with self._server.stats_lock:
+            return dict(self._server.stats)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
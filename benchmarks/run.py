@@ -0,0 +1,317 @@
+"""Offline end-to-end benchmarks for the resume analyzer and LinkedIn scraper.
+
+Everything runs against local stand-ins: a fake OpenAI-compatible server with
+configurable latency and token counts, and the HTML fixtures in
+benchmarks/fixtures/linkedin served with LinkedIn's URL layout. Results are
+written as JSON so runs can be compared:
+
+    python -m benchmarks.run --output baseline.json
+    python -m benchmarks.run --output current.json --compare baseline.json
+
+The scrape stages need Chrome and chromedriver; they are reported as skipped
+when no browser is available. Peak memory is Python heap (tracemalloc) per stage.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from benchmarks.corpus import build_corpus
+from benchmarks.fake_linkedin import FakeLinkedInServer
+from benchmarks.fake_openai import FakeOpenAIServer
+from fix_lexicon import detect_fixes
+
+COMPARED_METRICS = ("p50_ms", "p90_ms", "total_tokens")
+
+
+class Stage:
+    def __init__(self, name, openai_server):
+        self.name = name
+        self.openai_server = openai_server
+        self.latencies = []
+
+    def __enter__(self):
+        self._stats = self.openai_server.stats
+        tracemalloc.start()
+        self._start = time.perf_counter()
+        return self
+
+    def time(self, fn, *args):
+        start = time.perf_counter()
+        result = fn(*args)
+        self.latencies.append(time.perf_counter() - start)
+        return result
+
+    def __exit__(self, *exc):
+        self.wall = time.perf_counter() - self._start
+        _, self.peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        stats = self.openai_server.stats
+        self.requests = stats["requests"] - self._stats["requests"]
+        self.prompt_tokens = stats["prompt_tokens"] - self._stats["prompt_tokens"]
+        self.completion_tokens = stats["completion_tokens"] - self._stats["completion_tokens"]
+        self.rate_limited = stats["rate_limited"] - self._stats["rate_limited"]
+
+    def metrics(self):
+        latencies = np.asarray(self.latencies) * 1000
+        return {
+            "count": len(latencies),
+            "mean_ms": round(float(latencies.mean()), 3),
+            "p50_ms": round(float(np.percentile(latencies, 50)), 3),
+            "p90_ms": round(float(np.percentile(latencies, 90)), 3),
+            "p99_ms": round(float(np.percentile(latencies, 99)), 3),
+            "max_ms": round(float(latencies.max()), 3),
+            "throughput_per_s": round(len(latencies) / self.wall, 3) if self.wall else None,
+            "llm_requests": self.requests,
+            "rate_limited": self.rate_limited,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_tokens": self.prompt_tokens + self.completion_tokens,
+            "peak_memory_mb": round(self.peak / 2 ** 20, 3),
+        }
+
+
+def _configure_environment(workdir, openai_url, linkedin_url):
+    # Must run before the app modules are imported: they read these at import time
+    os.environ.update({
+        "OPENAI_API_BASE": openai_url,
+        "RESUME_ANALYZER_CACHE_DIR": os.path.join(workdir, "cache"),
+        "LINKEDIN_BASE_URL": linkedin_url,
+        "LINKEDIN_PROFILE_DIR": os.path.join(workdir, "profile"),
+        "LINKEDIN_JOB_STORE": os.path.join(workdir, "jobs.sqlite3"),
+        "LINKEDIN_HEADLESS": "1",
+        "LINKEDIN_DRIVER_POOL_SIZE": "1",
+        "RESUME_ANALYZER_TASK_DB": os.path.join(workdir, "tasks.sqlite3"),
+    })
+    warnings.filterwarnings("ignore")
+    import streamlit  # noqa: F401  (registers its loggers so they can be quietened)
+
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith("streamlit"):
+            logging.getLogger(name).setLevel(logging.ERROR)
+
+
+def _reset_analysis_cache():
+    from analysis_cache import get_cache
+
+    get_cache().clear()
+
+
+def bench_analysis(corpus, iterations, mode, openai_server, sessions=4):
+    import resume_analysis
+
+    results = {}
+    with Stage("resume_to_chunks", openai_server) as stage:
+        for _ in range(iterations):
+            for name, data in corpus:
+                _reset_analysis_cache()
+                stage.time(resume_analysis.documents_to_chunks, [(name, data)])
+    results[stage.name] = stage.metrics()
+
+    texts = [resume_analysis.documents_to_chunks([(name, data)])[0][1] for name, data in corpus]
+    with Stage("detect_fixes", openai_server) as stage:
+        for _ in range(iterations):
+            for text in texts:
+                stage.time(detect_fixes, text)
+    results[stage.name] = stage.metrics()
+
+    chunked = [resume_analysis.documents_to_chunks([(name, data)])[0][0] for name, data in corpus]
+    with Stage("run_openai_query", openai_server) as stage:
+        for _ in range(iterations):
+            for chunks in chunked:
+                _reset_analysis_cache()
+                stage.time(resume_analysis.run_openai_query, "bench", chunks, "Summarize this resume.",
+                           resume_analysis.RETRIEVAL_QUERIES["summary"])
+    results[stage.name] = stage.metrics()
+
+    with Stage(f"pipeline_{mode}", openai_server) as stage:
+        for _ in range(iterations):
+            for name, data in corpus:
+                _reset_analysis_cache()
+
+                def pipeline():
+                    chunks, _ = resume_analysis.documents_to_chunks([(name, data)])[0]
+                    return resume_analysis.analyze_resume("bench", chunks, mode, explain=True)
+
+                stage.time(pipeline)
+    results[stage.name] = stage.metrics()
+
+    # Several sessions analyzing the same resume at once; identical requests go out once
+    with Stage(f"pipeline_{mode}_{sessions}_sessions", openai_server) as stage:
+        for _ in range(iterations):
+            for name, data in corpus:
+                _reset_analysis_cache()
+                chunks, _ = resume_analysis.documents_to_chunks([(name, data)])[0]
+
+                def concurrent_sessions():
+                    with ThreadPoolExecutor(sessions) as pool:
+                        return list(pool.map(lambda _: resume_analysis.analyze_resume("bench", chunks, mode, explain=True),
+                                             range(sessions)))
+
+                stage.time(concurrent_sessions)
+    results[stage.name] = stage.metrics()
+
+    # Time until the first streamed piece of any section reaches the page
+    with Stage(f"pipeline_{mode}_first_output", openai_server) as stage:
+        for _ in range(iterations):
+            for name, data in corpus:
+                _reset_analysis_cache()
+                start = time.perf_counter()
+                first = []
+                chunks, _ = resume_analysis.documents_to_chunks([(name, data)])[0]
+                on_partial = lambda *_: first or first.append(time.perf_counter() - start)
+                for _ in resume_analysis.analyze_resumes("bench", {name: chunks}, 8, mode, on_partial=on_partial):
+                    pass
+                stage.latencies.append(first[0] if first else time.perf_counter() - start)
+    results[stage.name] = stage.metrics()
+
+    for name, data in corpus:
+        chunks, _ = resume_analysis.documents_to_chunks([(name, data)])[0]
+        resume_analysis.analyze_resume("bench", chunks, mode, explain=True)
+    with Stage(f"pipeline_{mode}_cached", openai_server) as stage:
+        for _ in range(iterations):
+            for name, data in corpus:
+                chunks, _ = resume_analysis.documents_to_chunks([(name, data)])[0]
+                stage.time(resume_analysis.analyze_resume, "bench", chunks, mode, True)
+    results[stage.name] = stage.metrics()
+    return results
+
+
+def _login(linkedin_url):
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    from linkedin_scraper import get_driver_pool, is_logged_in
+
+    pool = get_driver_pool()
+    with pool.driver() as driver:
+        driver.get(f"{linkedin_url}/login")
+        driver.find_element(By.ID, "sign-in").click()
+        WebDriverWait(driver, 30).until(is_logged_in)
+        pool.save_cookies(driver)
+
+
+def bench_scrape(iterations, num_jobs, openai_server, linkedin_url):
+    from background_tasks import search_jobs
+    from job_store import get_job_store
+
+    results = {}
+    try:
+        with Stage("linkedin_login", openai_server) as stage:
+            stage.time(_login, linkedin_url)
+        results[stage.name] = stage.metrics()
+    except Exception as e:
+        return {"scrape_jobs": {"skipped": f"{type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''}"}}
+
+    summary = "Data scientist with Python, SQL, Spark and AWS experience."
+    with Stage("scrape_jobs_cold_index", openai_server) as stage:
+        for _ in range(iterations):
+            get_job_store().clear()
+            stage.time(search_jobs, "Data Scientist", "United States", summary, num_jobs)
+    results[stage.name] = stage.metrics()
+
+    with Stage("scrape_jobs_warm_index", openai_server) as stage:
+        for _ in range(iterations):
+            stage.time(search_jobs, "Data Scientist", "United States", summary, num_jobs)
+    results[stage.name] = stage.metrics()
+    return results
+
+
+def compare(current, baseline, threshold):
+    regressions = []
+    print(f"{'stage':<32} {'metric':<14} {'baseline':>12} {'current':>12} {'change':>8}")
+    for stage, metrics in current["stages"].items():
+        before = baseline.get("stages", {}).get(stage)
+        if not before or "skipped" in metrics or "skipped" in before:
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = before.get(metric), metrics.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            flag = " !" if change > threshold else ""
+            print(f"{stage:<32} {metric:<14} {old:>12.3f} {new:>12.3f} {change:>+7.1%}{flag}")
+            if change > threshold:
+                regressions.append((stage, metric, change))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--sizes", default="1,2,5,10", help="resume lengths in pages")
+    parser.add_argument("--per-size", type=int, default=2, help="resumes per length (alternating PDF/DOCX)")
+    parser.add_argument("--mode", choices=["structured", "per-prompt"], default="structured")
+    parser.add_argument("--llm-latency-ms", type=float, default=300)
+    parser.add_argument("--llm-jitter-ms", type=float, default=50)
+    parser.add_argument("--token-latency-ms", type=float, default=10, help="delay between streamed words")
+    parser.add_argument("--completion-tokens", type=int, default=None,
+                        help="fixed completion size reported by the fake server")
+    parser.add_argument("--rate-limit-rpm", type=int, default=None,
+                        help="requests per minute the fake server accepts before answering 429")
+    parser.add_argument("--sessions", type=int, default=4, help="concurrent sessions analyzing the same resume")
+    parser.add_argument("--page-latency-ms", type=float, default=100)
+    parser.add_argument("--num-jobs", type=int, default=50)
+    parser.add_argument("--skip-scrape", action="store_true")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative regression")
+    args = parser.parse_args(argv)
+
+    corpus = build_corpus(tuple(int(size) for size in args.sizes.split(",")), args.per_size)
+    with tempfile.TemporaryDirectory() as workdir, \
+            FakeOpenAIServer(args.llm_latency_ms / 1000, args.llm_jitter_ms / 1000,
+                             completion_tokens=args.completion_tokens,
+                             token_latency=args.token_latency_ms / 1000,
+                             requests_per_minute=args.rate_limit_rpm) as openai_server, \
+            FakeLinkedInServer(total_jobs=args.num_jobs * 2, page_latency=args.page_latency_ms / 1000) as linkedin:
+        _configure_environment(workdir, openai_server.base_url, linkedin.base_url)
+        stages = bench_analysis(corpus, args.iterations, args.mode, openai_server, args.sessions)
+        if not args.skip_scrape:
+            stages.update(bench_scrape(args.iterations, args.num_jobs, openai_server, linkedin.base_url))
+
+        from linkedin_scraper import get_driver_pool
+        get_driver_pool().close()
+
+    result = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "corpus": [{"name": name, "bytes": len(data)} for name, data in corpus],
+            "args": vars(args),
+        },
+        "stages": stages,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+
+    for stage, metrics in stages.items():
+        if "skipped" in metrics:
+            print(f"{stage:<32} skipped ({metrics['skipped']})")
+        else:
+            print(f"{stage:<32} p50 {metrics['p50_ms']:>9.1f} ms  p90 {metrics['p90_ms']:>9.1f} ms"
+                  f"  {metrics['throughput_per_s']:>8.2f}/s  tokens {metrics['total_tokens']:>8}"
+                  f"  peak {metrics['peak_memory_mb']:>7.1f} MB")
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(result, json.load(f), args.threshold)
+        if regressions:
+            print(f"{len(regressions)} metric(s) regressed by more than {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+"""Analyze a directory of PDF/DOCX resumes without the Streamlit UI.
+
+    python bulk_analyze.py resumes/ --output results.jsonl --workers 16 --max-in-flight 32
+
+Results are appended as each resume finishes. Re-running with the same output
+skips resumes that already succeeded, so an interrupted run resumes where it
+stopped. An output ending in .parquet is written as a directory of part files.
+"""
+import argparse
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import resume_analysis
+from llm_scheduler import BATCH
+from resume_analysis import ANALYSIS_MODE, FIXES_ENGINE, FIXES_ENGINES, analyze_resume, documents_to_chunks, is_supported
+
+
+def find_resumes(directory):
+    for root, _, files in os.walk(directory):
+        for name in sorted(files):
+            if is_supported(name):
+                yield os.path.join(root, name)
+
+
+class JsonlWriter:
+    def __init__(self, path):
+        self.path = path
+
+    def completed(self):
+        done = set()
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # a line cut short by an interrupted run
+                    if "error" not in record:
+                        done.add(record["sha256"])
+        return done
+
+    def __enter__(self):
+        self._file = open(self.path, "a", encoding="utf-8")
+        return self
+
+    def write(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def __exit__(self, *exc):
+        self._file.close()
+
+
+class ParquetWriter:
+    # Parquet files cannot be appended to, so records are flushed in numbered part files
+    def __init__(self, path, flush_every=100):
+        self.path = path
+        self.flush_every = flush_every
+        self._buffer = []
+
+    def completed(self):
+        import pandas as pd
+
+        done = set()
+        if os.path.isdir(self.path):
+            for name in os.listdir(self.path):
+                if name.endswith(".parquet"):
+                    frame = pd.read_parquet(os.path.join(self.path, name), columns=["sha256", "error"])
+                    done.update(frame.loc[frame["error"].isna(), "sha256"])
+        return done
+
+    def __enter__(self):
+        # Fail before any resume is analyzed rather than at the first flush
+        if not any(importlib.util.find_spec(engine) for engine in ("pyarrow", "fastparquet")):
+            raise ImportError("Parquet output needs pyarrow (pip install pyarrow); use a .jsonl output otherwise")
+        os.makedirs(self.path, exist_ok=True)
+        return self
+
+    def write(self, record):
+        self._buffer.append(record)
+        if len(self._buffer) >= self.flush_every:
+            self._flush()
+
+    def _flush(self):
+        import pandas as pd
+
+        if not self._buffer:
+            return
+        frame = pd.DataFrame(self._buffer)
+        if "error" not in frame:
+            frame["error"] = None
+        if "fixes" in frame:
+            frame["fixes"] = frame["fixes"].map(lambda fixes: json.dumps(fixes) if isinstance(fixes, list) else None)
+        part = os.path.join(self.path, f"part-{time.time_ns()}.parquet")
+        frame.to_parquet(part + ".tmp", index=False)
+        os.replace(part + ".tmp", part)
+        self._buffer = []
+
+    def __exit__(self, *exc):
+        self._flush()
+
+
+class Progress:
+    def __init__(self, total, interval=10.0):
+        self.total = total
+        self.interval = interval
+        self.done = 0
+        self.failed = 0
+        self._start = time.time()
+        self._start_tokens = resume_analysis.get_token_usage().total_tokens
+        self._last_report = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, ok):
+        with self._lock:
+            self.done += 1
+            self.failed += 0 if ok else 1
+            if time.time() - self._last_report >= self.interval or self.done == self.total:
+                self._last_report = time.time()
+                self.report()
+
+    def report(self):
+        minutes = max(time.time() - self._start, 1e-6) / 60
+        tokens = resume_analysis.get_token_usage().total_tokens - self._start_tokens
+        print(
+            f"[{self.done}/{self.total}] failed {self.failed}"
+            f" | {self.done / minutes:.1f} resumes/min | {tokens / minutes:,.0f} tokens/min",
+            file=sys.stderr,
+            flush=True,
+        )
+
+
+def analyze_file(api_key, path, directory, mode, explain, fixes=FIXES_ENGINE):
+    with open(path, "rb") as f:
+        data = f.read()
+    record = {"file": os.path.relpath(path, directory), "sha256": hashlib.sha256(data).hexdigest()}
+    try:
+        chunks, text = documents_to_chunks([(path, data)], use_pool=True)[0]
+        if not chunks:
+            raise ValueError("No text could be extracted")
+        # Batch priority only orders requests within this process; the app's server has its own scheduler
+        result = analyze_resume(api_key, chunks, mode, explain, text, fixes, BATCH)
+        errors = result.pop("errors", None)
+        record.update(result)
+        if errors:
+            # Recorded as a failure, so the next run retries this resume
+            record["error"] = "; ".join(f"{field}: {message}" for field, message in errors.items())
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+    return record
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory", help="directory searched recursively for .pdf and .docx files")
+    parser.add_argument("--output", default="results.jsonl", help="results file (.jsonl or .parquet)")
+    parser.add_argument("--workers", type=int, default=8, help="resumes processed at once")
+    parser.add_argument("--max-in-flight", type=int, default=resume_analysis.LLM_MAX_IN_FLIGHT,
+                        help="maximum concurrent LLM requests across all workers")
+    parser.add_argument("--mode", choices=["structured", "per-prompt"], default=ANALYSIS_MODE)
+    parser.add_argument("--fixes", choices=FIXES_ENGINES, default=FIXES_ENGINE,
+                        help="find Top Fixes locally, locally plus the LLM, or with the LLM only")
+    parser.add_argument("--explain", action="store_true", help="also generate the score explanation")
+    parser.add_argument("--api-key", default=os.environ.get("OPENAI_API_KEY"))
+    args = parser.parse_args(argv)
+
+    if not args.api_key:
+        parser.error("an OpenAI API key is required (--api-key or OPENAI_API_KEY)")
+    resume_analysis.set_max_in_flight(args.max_in_flight)
+
+    writer = ParquetWriter(args.output) if args.output.endswith(".parquet") else JsonlWriter(args.output)
+    completed = writer.completed()
+    paths = list(find_resumes(args.directory))
+    todo = []
+    for path in paths:
+        with open(path, "rb") as f:
+            if hashlib.sha256(f.read()).hexdigest() not in completed:
+                todo.append(path)
+    print(f"{len(paths)} resumes found, {len(paths) - len(todo)} already done, {len(todo)} to analyze",
+          file=sys.stderr)
+
+    progress = Progress(len(todo))
+    with writer, ThreadPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(analyze_file, args.api_key, path, args.directory, args.mode, args.explain, args.fixes)
+                   for path in todo]
+        try:
+            for future in as_completed(futures):
+                record = future.result()
+                writer.write(record)
+                progress.record("error" not in record)
+        except KeyboardInterrupt:
+            print("Interrupted; finished results are saved, re-run to resume.", file=sys.stderr)
+            for future in futures:
+                future.cancel()
+            return 130
+    return 1 if progress.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+import os
+import re
+from functools import lru_cache
+
+# Decides what resume text goes into each "stuff" prompt. Chunks are packed by
+# usefulness into a token budget, counted with the model's own tokenizer; adjacent
+# chunks are joined with their shared overlap removed, so the budget buys unique
+# text. Chunks never straddle a section heading, so each one stays on one topic.
+CONTEXT_TOKENS = int(os.environ.get("RESUME_ANALYZER_CONTEXT_TOKENS", "900"))
+# Per-prompt overrides, e.g. RESUME_ANALYZER_CONTEXT_BUDGETS="structured=1800,score=600"
+CONTEXT_BUDGETS = {
+    purpose.strip(): int(tokens)
+    for purpose, tokens in (item.split("=", 1) for item in os.environ.get("RESUME_ANALYZER_CONTEXT_BUDGETS", "").split(",") if "=" in item)
+}
+
+SECTION_HEADINGS = (
+    "summary", "professional summary", "profile", "objective", "about me",
+    "experience", "work experience", "professional experience", "employment", "employment history", "work history",
+    "skills", "technical skills", "core skills", "key skills", "core competencies",
+    "education", "academic background", "projects", "key projects", "certifications", "certificates",
+    "publications", "awards", "achievements", "languages", "volunteering", "volunteer experience", "interests",
+)
+SECTION_RE = re.compile(
+    r"^[ \t]*(?:%s)[ \t]*:?[ \t]*$" % "|".join(re.escape(heading) for heading in SECTION_HEADINGS),
+    re.IGNORECASE | re.MULTILINE,
+)
+
+
+def budget_for(purpose):
+    return CONTEXT_BUDGETS.get(purpose, CONTEXT_TOKENS)
+
+
+@lru_cache(maxsize=None)
+def _encoding(model):
+    import tiktoken
+
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return None  # a model tiktoken does not know
+    except (OSError, ValueError):
+        return None  # the encoding could not be downloaded, or the download was corrupt
+
+
+def count_tokens(text, model):
+    encoding = _encoding(model)
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def overlap_length(previous, following, max_overlap):
+    # Longest end of previous that following starts with
+    for size in range(min(len(previous), len(following), max_overlap), 0, -1):
+        if following.startswith(previous[-size:]):
+            return size
+    return 0
+
+
+def plan_context(chunks, order, budget, model, max_overlap):
+    # order: chunk indices, most useful first. Returns the pages to stuff (each a run of
+    # adjacent chunks joined without their overlap, in document order) and token stats.
+    overlaps = [0] + [overlap_length(chunks[i - 1], chunks[i], max_overlap) for i in range(1, len(chunks))]
+    chosen = set()
+    used = 0
+    for i in order:
+        start = overlaps[i] if i - 1 in chosen else 0
+        cost = count_tokens(chunks[i][start:], model)
+        if i + 1 in chosen:
+            cost -= count_tokens(chunks[i + 1][:overlaps[i + 1]], model)
+        if chosen and used + cost > budget:
+            continue
+        chosen.add(i)
+        used += cost
+
+    pages = []
+    for i in sorted(chosen):
+        if i - 1 in chosen:
+            # Without an overlap the splitter dropped the separator between them
+            pages[-1] += chunks[i][overlaps[i]:] if overlaps[i] else "\n" + chunks[i]
+        else:
+            pages.append(chunks[i])
+    context_tokens = sum(count_tokens(page, model) for page in pages)
+    stuffed_tokens = sum(count_tokens(chunks[i], model) for i in chosen)
+    return pages, {
+        "chunks_used": len(chosen),
+        "chunks_total": len(chunks),
+        "context_tokens": context_tokens,
+        "tokens_saved": stuffed_tokens - context_tokens,
+    }
@@ -0,0 +1,113 @@
+import io
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from PyPDF2 import PdfReader
+from docx import Document as DocxReader
+
+# Text is pulled out page by page (each page extracted exactly once) and fed to the
+# splitter as it arrives, so no stage builds a whole-document string. Batches and
+# long PDFs are spread over a process pool in page ranges of PAGES_PER_TASK. Splitting
+# a PDF opens it once in this process to count its pages, and each range's task carries
+# (pickles) the whole file and opens it again; for resume-sized PDFs that is a few ms
+# against tens of ms of text extraction. Workers are spawned rather than forked: the
+# pool is created from threads of a server that hold locks (SQLite, logging, HTTP
+# clients), and a forked child could inherit one of them locked.
+PAGES_PER_TASK = int(os.environ.get("RESUME_ANALYZER_PAGES_PER_TASK", "8"))
+EXTRACTION_WORKERS = int(os.environ.get("RESUME_ANALYZER_EXTRACTION_WORKERS", str(os.cpu_count() or 1)))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_process_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=EXTRACTION_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def iter_pdf_pages(data, start=0, stop=None):
+    reader = PdfReader(io.BytesIO(data))
+    for page in reader.pages[start:stop]:
+        text = page.extract_text()
+        if text:
+            yield text
+
+
+def iter_docx_paragraphs(data):
+    doc = DocxReader(io.BytesIO(data))
+    for i, para in enumerate(doc.paragraphs):
+        yield para.text if i == 0 else "\n" + para.text
+
+
+def iter_document_text(name, data):
+    if name.endswith(".pdf"):
+        return iter_pdf_pages(data)
+    return iter_docx_paragraphs(data)
+
+
+def extract_page_range(data, start, stop):
+    # Runs in a worker process; returns only this range's text
+    return list(iter_pdf_pages(data, start, stop))
+
+
+def extract_document(name, data):
+    return list(iter_document_text(name, data))
+
+
+def _tasks_for(name, data):
+    if name.endswith(".pdf"):
+        page_count = len(PdfReader(io.BytesIO(data)).pages)
+        if page_count > PAGES_PER_TASK:
+            return [(extract_page_range, data, start, min(start + PAGES_PER_TASK, page_count))
+                    for start in range(0, page_count, PAGES_PER_TASK)]
+    return [(extract_document, name, data)]
+
+
+def iter_documents_text(documents, use_pool=None):
+    # documents: list of (name, data). Yields one text-piece generator per document, in
+    # order; every page range of every document is already queued on the pool.
+    tasks = [_tasks_for(name, data) for name, data in documents]
+    if use_pool is None:
+        use_pool = len(documents) > 1 or len(tasks[0]) > 1 if documents else False
+    if not use_pool:
+        for name, data in documents:
+            yield iter_document_text(name, data)
+        return
+
+    pool = get_process_pool()
+    futures = [[pool.submit(*task) for task in document_tasks] for document_tasks in tasks]
+    for document_futures in futures:
+        yield (piece for future in document_futures for piece in future.result())
+
+
+def split_stream(pieces, chunk_size, chunk_overlap, section_re=None):
+    # Splits text as it arrives. The last chunk of every window is held back and
+    # re-split with the next piece, so chunk boundaries match a whole-text split
+    # as closely as the splitter allows while only a few pages sit in memory.
+    # Where section_re matches, everything before it is flushed, so no chunk
+    # spans two sections.
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+    splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    buffer = ""
+    for piece in pieces:
+        cuts = [match.start() for match in section_re.finditer(piece)] if section_re else []
+        for start, end in zip([0] + cuts, cuts + [len(piece)]):
+            if start in cuts and buffer.strip():
+                yield from splitter.split_text(buffer)
+                buffer = ""
+            buffer += piece[start:end]
+            if len(buffer) < chunk_size * 4:
+                continue
+            chunks = splitter.split_text(buffer)
+            for chunk in chunks[:-1]:
+                yield chunk
+            tail = chunks[-1] if chunks else ""
+            buffer = buffer[buffer.rfind(tail):] if tail else ""
+    if buffer:
+        yield from splitter.split_text(buffer)
@@ -0,0 +1,252 @@
+import re
+from collections import Counter
+
+from chunk_planner import SECTION_RE
+
+# Local Top Fixes: weak verbs, buzzwords and filler words are found with one regex
+# compiled from a character trie of every phrase, and consistency (bullets, tense,
+# dates) is checked line by line. Output matches what the LLM prompt returns:
+# [{"issue", "score", "details": [{"word", "suggestion"}]}] for each category.
+# Buzzwords and weak verbs only count in written lines, not in list sections such as
+# Skills ("Dynamic Programming"), and a weak verb only where it starts a clause
+# ("Used Python", not "a dashboard used by 200 analysts").
+FIX_CATEGORIES = ["Weak Verbs", "Buzzwords", "Filler Words", "Consistency"]
+MAX_DETAILS = 5
+
+WEAK_VERBS = {
+    "worked on": "Replace with 'built', 'developed' or 'delivered'",
+    "helped": "Replace with 'led', 'drove' or 'enabled'",
+    "helped with": "Replace with 'led', 'coordinated' or 'orchestrated'",
+    "assisted": "Replace with 'supported' plus what you delivered",
+    "assisted with": "Say what you delivered, e.g. 'delivered' or 'implemented'",
+    "assisted in": "Say what you delivered, e.g. 'delivered' or 'implemented'",
+    "responsible for": "Replace with 'owned', 'led' or 'managed'",
+    "was responsible for": "Replace with 'owned', 'led' or 'managed'",
+    "involved in": "Replace with your role: 'led', 'built' or 'designed'",
+    "was involved in": "Replace with your role: 'led', 'built' or 'designed'",
+    "participated in": "Replace with 'contributed', 'drove' or 'co-led'",
+    "took part in": "Replace with 'contributed', 'drove' or 'co-led'",
+    "was part of": "Say what you did on the team",
+    "handled": "Replace with 'managed', 'resolved' or 'processed'",
+    "dealt with": "Replace with 'resolved' or 'managed'",
+    "worked with": "Replace with 'partnered with' or 'collaborated with'",
+    "was tasked with": "Start with the action you took",
+    "tasked with": "Start with the action you took",
+    "duties included": "List achievements instead of duties",
+    "in charge of": "Replace with 'led', 'directed' or 'headed'",
+    "tried to": "State what you achieved",
+    "did": "Replace with a specific verb such as 'executed' or 'completed'",
+    "made": "Replace with 'created', 'built' or 'produced'",
+    "got": "Replace with 'achieved', 'earned' or 'secured'",
+    "used": "Replace with 'applied', 'leveraged' or 'deployed'",
+    "utilized": "Replace with 'used', or better, what you achieved with it",
+    "supported": "Say how: 'enabled', 'maintained' or 'advised'",
+    "contributed to": "Quantify your part: 'delivered', 'drove' or 'authored'",
+}
+
+BUZZWORDS = {
+    phrase: "Show it with a concrete achievement instead"
+    for phrase in (
+        "synergy", "synergies", "results-driven", "results driven", "results-oriented", "detail-oriented",
+        "detail oriented", "team player", "go-getter", "self-starter", "self starter", "self-motivated",
+        "highly motivated", "motivated", "hard-working", "hardworking", "hard worker", "dynamic",
+        "proactive", "passionate", "think outside the box", "outside the box", "out-of-the-box",
+        "best of breed", "best-in-class", "thought leader", "thought leadership", "value add", "value-add",
+        "game changer", "game-changer", "rockstar", "rock star", "ninja", "guru", "strategic thinker",
+        "innovative", "cutting-edge", "cutting edge", "world-class", "seasoned", "visionary",
+        "proven track record", "track record", "excellent communication skills", "strong communication skills",
+        "fast-paced environment", "fast paced environment", "go-to person", "wear many hats", "move the needle",
+        "paradigm shift", "disruptive", "holistic", "robust", "seamless", "seamlessly", "bandwidth",
+    )
+}
+
+FILLER_WORDS = {
+    "very": "Remove or replace with a specific descriptor",
+    "really": "Remove",
+    "actually": "Remove",
+    "basically": "Remove",
+    "just": "Remove",
+    "quite": "Remove or quantify",
+    "extremely": "Remove or quantify",
+    "simply": "Remove",
+    "literally": "Remove",
+    "completely": "Remove",
+    "various": "Name the specific items",
+    "a lot of": "Replace with a number",
+    "lots of": "Replace with a number",
+    "a number of": "Replace with the actual number",
+    "in order to": "Replace with 'to'",
+    "due to the fact that": "Replace with 'because'",
+    "for the purpose of": "Replace with 'to' or 'for'",
+    "at this point in time": "Replace with 'now'",
+    "in the process of": "Remove or use the verb directly",
+    "successfully": "Remove; show the result instead",
+    "etc": "List what matters and drop 'etc.'",
+    "and so on": "List what matters or remove",
+}
+
+_BULLET_RE = re.compile(r"^\s*([•●▪◦‣∙·■□➢➤►\-–—*])\s+(\S.*)$")
+_LIST_SECTIONS = (
+    "skills", "technical skills", "core skills", "key skills", "core competencies", "education",
+    "academic background", "certifications", "certificates", "publications", "awards", "languages", "interests",
+)
+_INLINE_LIST_RE = re.compile(r"^\s*(?:%s)\s*:\s*\S" % "|".join(re.escape(section) for section in _LIST_SECTIONS), re.IGNORECASE)
+_CLAUSE_START_RE = re.compile(r"(?:^\s*(?:[•●▪◦‣∙·■□➢➤►\-–—*]\s+)?|[.;:,]\s+|\b(?:and|I)\s+)$", re.IGNORECASE)
+# A non-bullet line with a year (a role's title and dates) starts the next role
+_YEAR_RE = re.compile(r"\b(?:19|20)\d{2}\b")
+_IRREGULAR_PAST = frozenset(
+    "led built wrote ran drove made grew won began oversaw taught sold brought held set spent gave took "
+    "kept met found chose rebuilt rewrote drew bought fought sought shot shrank split spun stood".split()
+)
+_ACTION_VERBS = frozenset(
+    "manage lead develop build design create implement analyze analyse coordinate drive improve maintain "
+    "support deliver write own run plan test deploy mentor train collaborate oversee optimize optimise "
+    "automate conduct prepare monitor handle work help assist research present negotiate increase reduce "
+    "launch establish organize organise architect engineer migrate integrate review define partner "
+    "streamline scale ship teach sell grow direct supervise evaluate identify resolve model forecast".split()
+)
+_DATE_STYLES = {
+    "Jan 2020": re.compile(r"\b(?:Jan|Feb|Mar|Apr|Jun|Jul|Aug|Sept?|Oct|Nov|Dec)\.?\s+(?:19|20)\d{2}\b"),
+    "January 2020": re.compile(
+        r"\b(?:January|February|March|April|June|July|August|September|October|November|December)\s+(?:19|20)\d{2}\b"
+    ),
+    "01/2020": re.compile(r"\b(?:0?[1-9]|1[0-2])/(?:19|20)\d{2}\b"),
+    "2020-01": re.compile(r"\b(?:19|20)\d{2}-(?:0[1-9]|1[0-2])\b"),
+}
+
+
+def _normalize(phrase):
+    return " ".join(phrase.lower().split())
+
+
+def _trie_pattern(phrases):
+    # Phrases sharing a prefix share a branch, so the regex engine walks each
+    # position once instead of trying every phrase; longer phrases win.
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node):
+        branches = [(r"\s+" if char == " " else re.escape(char)) + build(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{pattern})?" if "" in node else pattern
+
+    return build(trie)
+
+
+_LEXICON = {}
+for _category, _phrases in (("Weak Verbs", WEAK_VERBS), ("Buzzwords", BUZZWORDS), ("Filler Words", FILLER_WORDS)):
+    for _phrase, _suggestion in _phrases.items():
+        _LEXICON[_normalize(_phrase)] = (_category, _suggestion)
+_LEXICON_RE = re.compile(r"(?<![\w-])(" + _trie_pattern(sorted(_LEXICON)) + r")(?![\w-])", re.IGNORECASE)
+
+
+def _severity(hits, words):
+    if not hits:
+        return 1
+    per_hundred_words = hits * 100 / max(words, 100)
+    return min(10, max(2, round(1 + per_hundred_words * 4)))
+
+
+def _verb_tense(word):
+    word = word.lower().strip(",.;:")
+    if word in _IRREGULAR_PAST or (len(word) > 4 and word.endswith("ed")):
+        return "past"
+    if word in _ACTION_VERBS or word[:-3] in _ACTION_VERBS and word.endswith("ing"):
+        return "present"
+    if word[:-1] in _ACTION_VERBS and word.endswith("s") or word[:-2] in _ACTION_VERBS and word.endswith("es"):
+        return "present"
+    return None
+
+
+def _written_lines(text):
+    # Yields (line, is written text): False inside list sections and for inline "Skills: ..." lines
+    in_list = False
+    for line in text.splitlines():
+        heading = SECTION_RE.match(line)
+        if heading:
+            in_list = _normalize(heading.group().strip().rstrip(":")) in _LIST_SECTIONS
+            yield line, False
+        else:
+            yield line, not in_list and not _INLINE_LIST_RE.match(line)
+
+
+def _roles(text):
+    # Bullet texts grouped by the role (dated line or section heading) they follow
+    roles = [[]]
+    for line in text.splitlines():
+        bullet = _BULLET_RE.match(line)
+        if bullet:
+            roles[-1].append(bullet.group(2))
+        elif _YEAR_RE.search(line) or SECTION_RE.match(line):
+            if roles[-1]:
+                roles.append([])
+    return roles
+
+
+def consistency_issues(text):
+    details = []
+    bullets = [match.groups() for match in map(_BULLET_RE.match, text.splitlines()) if match]
+
+    markers = Counter(marker for marker, _ in bullets)
+    if len(markers) > 1:
+        details.append({"word": "Bullet styles: " + " ".join(marker for marker, _ in markers.most_common()),
+                        "suggestion": "Use one bullet symbol throughout"})
+
+    with_period = sum(1 for _, line in bullets if line.rstrip().endswith("."))
+    if len(bullets) >= 3 and 0 < with_period < len(bullets):
+        details.append({"word": f"{with_period} of {len(bullets)} bullets end with a period",
+                        "suggestion": "End every bullet the same way"})
+
+    # Present tense for the current role and past for earlier ones is right; mixing within one role is not
+    for role in _roles(text):
+        tenses = {}
+        for line in role:
+            tense = _verb_tense(line.split()[0])
+            if tense:
+                tenses.setdefault(tense, []).append(line.split()[0])
+        if len(tenses) > 1:
+            details.append({"word": f"Mixed tenses within one role: '{tenses['present'][0]}' / '{tenses['past'][0]}'",
+                            "suggestion": "Use one tense per role: present for your current role, past for earlier ones"})
+            break
+
+    date_styles = [(style, pattern.search(text)) for style, pattern in _DATE_STYLES.items()]
+    date_styles = [(style, match.group()) for style, match in date_styles if match]
+    if len(date_styles) > 1:
+        details.append({"word": "Date formats: " + " / ".join(example for _, example in date_styles),
+                        "suggestion": f"Write every date the same way, e.g. '{date_styles[0][0]}'"})
+    return details
+
+
+def detect_fixes(text):
+    words = len(text.split())
+    found = {category: Counter() for category in FIX_CATEGORIES}
+    first_seen = {}
+    for line, written in _written_lines(text):
+        for match in _LEXICON_RE.finditer(line):
+            phrase = _normalize(match.group())
+            category, _ = _LEXICON[phrase]
+            if category != "Filler Words" and not written:
+                continue
+            if category == "Weak Verbs" and not _CLAUSE_START_RE.search(line, 0, match.start()):
+                continue
+            found[category][phrase] += 1
+            first_seen.setdefault(phrase, match.group())
+
+    fixes = []
+    for category in FIX_CATEGORIES[:3]:
+        counts = found[category]
+        details = [
+            {"word": first_seen[phrase] + (f" (×{count})" if count > 1 else ""), "suggestion": _LEXICON[phrase][1]}
+            for phrase, count in counts.most_common(MAX_DETAILS)
+        ]
+        fixes.append({"issue": category, "score": _severity(sum(counts.values()), words), "details": details})
+    consistency = consistency_issues(text)
+    fixes.append({"issue": "Consistency", "score": min(10, 1 + 3 * len(consistency)), "details": consistency})
+    return fixes
@@ -0,0 +1,91 @@
+import re
+
+import numpy as np
+
+from analysis_cache import content_hash, get_cache
+from resume_analysis import parse_json_response, run_openai_query
+from vector_index import EMBEDDING_MODEL, embed_texts
+
+# Scores every job against the resume in one vectorized pass: TF-IDF (no API calls)
+# or cached embeddings, with an optional single LLM call to re-rank the top few.
+_TOKEN_RE = re.compile(r"[a-z][a-z0-9+#.\-]*[a-z0-9+#]|[a-z]")
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our the their this to we will with you your".split()
+)
+
+
+def tokenize(text):
+    return [token for token in _TOKEN_RE.findall((text or "").lower()) if token not in STOP_WORDS]
+
+
+def job_text(job):
+    return "\n".join(part for part in (job.get("title"), job.get("text"), job.get("description")) if part)
+
+
+def tfidf_scores(resume_text, job_texts):
+    documents = [tokenize(resume_text)] + [tokenize(text) for text in job_texts]
+    vocabulary = {}
+    rows, cols = [], []
+    for row, tokens in enumerate(documents):
+        for token in tokens:
+            rows.append(row)
+            cols.append(vocabulary.setdefault(token, len(vocabulary)))
+    if not vocabulary:
+        return np.zeros(len(job_texts), dtype=np.float32)
+
+    counts = np.zeros((len(documents), len(vocabulary)), dtype=np.float32)
+    np.add.at(counts, (np.array(rows), np.array(cols)), 1)
+    tf = np.log1p(counts)
+    document_frequency = np.count_nonzero(counts, axis=0)
+    idf = np.log((1 + len(documents)) / (1 + document_frequency)) + 1
+    weights = tf * idf
+    weights /= np.maximum(np.linalg.norm(weights, axis=1, keepdims=True), 1e-12)
+    return weights[1:] @ weights[0]
+
+
+def embedding_scores(api_key, resume_text, job_texts, model=EMBEDDING_MODEL):
+    # Job vectors are cached per text, so only jobs never seen before are embedded
+    texts = [resume_text] + list(job_texts)
+    keys = [content_hash(model, text) for text in texts]
+    vectors = [get_cache().get("text-embedding", key) for key in keys]
+    missing = [i for i, vector in enumerate(vectors) if vector is None]
+    if missing:
+        for i, vector in zip(missing, embed_texts(api_key, [texts[i] for i in missing], model)):
+            vectors[i] = vector.tolist()
+            get_cache().set("text-embedding", keys[i], vectors[i])
+    matrix = np.asarray(vectors, dtype=np.float32)
+    matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+    return matrix[1:] @ matrix[0]
+
+
+def llm_rerank(api_key, resume_summary, jobs, scores, top_n):
+    # One call grades the top_n jobs; its 0-100 grades replace their vector scores
+    order = np.argsort(-scores)[:top_n]
+    listing = "\n".join(f"{i + 1}. {job_text(jobs[index])[:600]}" for i, index in enumerate(order))
+    prompt = (
+        "Rate how well this candidate fits each of the jobs below on a scale from 0 to 100. "
+        "Answer only with a JSON list of numbers, one per job, in the same order.\n\n" + listing
+    )
+    try:
+        grades = parse_json_response(run_openai_query(api_key, resume_summary, prompt, purpose="job_rerank"))
+        grades = [min(max(float(grade), 0), 100) / 100 for grade in grades][:len(order)]
+    except (ValueError, TypeError):
+        return scores
+    reranked = scores.copy()
+    # Keep re-ranked jobs above the rest, whatever their vector score was
+    reranked[order[:len(grades)]] = 1 + np.asarray(grades, dtype=np.float32)
+    return reranked
+
+
+def rank_jobs(resume_text, jobs, method="tfidf", api_key=None, rerank_top_n=0, resume_summary=None):
+    # Returns one relevance score per job, in the order given
+    if not jobs:
+        return np.zeros(0, dtype=np.float32)
+    texts = [job_text(job) for job in jobs]
+    if method == "embedding":
+        scores = embedding_scores(api_key, resume_text, texts)
+    else:
+        scores = tfidf_scores(resume_text, texts)
+    if rerank_top_n and api_key:
+        scores = llm_rerank(api_key, resume_summary or resume_text, jobs, scores, rerank_top_n)
+    return scores
@@ -0,0 +1,128 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+
+# Local index of every LinkedIn job seen per (role, location). Searches are sorted by
+# date, so a repeat search only has to walk pages until it reaches jobs already here.
+JOB_STORE_PATH = os.environ.get("LINKEDIN_JOB_STORE", "linkedin_jobs.sqlite3")
+REFRESH_SECONDS = int(os.environ.get("LINKEDIN_REFRESH_MINUTES", "30")) * 60
+
+_JOB_ID_RE = re.compile(r"/jobs/view/(?:[^/?#]*?-)?(\d+)")
+
+
+def job_id_from_url(url):
+    match = _JOB_ID_RE.search(url or "")
+    return match.group(1) if match else None
+
+
+def _normalize(value):
+    return " ".join(value.lower().split())
+
+
+class JobStore:
+    def __init__(self, path=JOB_STORE_PATH):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " role TEXT NOT NULL,"
+            " location TEXT NOT NULL,"
+            " job_id TEXT NOT NULL,"
+            " url TEXT NOT NULL,"
+            " title TEXT,"
+            " card_text TEXT,"
+            " description TEXT,"
+            " first_seen REAL NOT NULL,"
+            " last_seen REAL NOT NULL,"
+            " PRIMARY KEY (role, location, job_id));"
+            "CREATE INDEX IF NOT EXISTS jobs_recent ON jobs (role, location, first_seen DESC);"
+            "CREATE TABLE IF NOT EXISTS searches ("
+            " role TEXT NOT NULL,"
+            " location TEXT NOT NULL,"
+            " last_run REAL NOT NULL,"
+            " PRIMARY KEY (role, location));"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        if "description" not in columns:
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN description TEXT")
+        self._conn.commit()
+
+    def known_ids(self, role, location):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT job_id FROM jobs WHERE role = ? AND location = ?", (_normalize(role), _normalize(location))
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def add_jobs(self, role, location, jobs):
+        # jobs: dicts with job_id, url and optional title/text, newest first
+        now = time.time()
+        role, location = _normalize(role), _normalize(location)
+        with self._lock:
+            for job in jobs:
+                self._conn.execute(
+                    "INSERT INTO jobs (role, location, job_id, url, title, card_text, first_seen, last_seen)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+                    " ON CONFLICT (role, location, job_id) DO UPDATE SET last_seen = excluded.last_seen",
+                    (role, location, job["job_id"], job["url"], job.get("title"), job.get("text"), now, now),
+                )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO searches (role, location, last_run) VALUES (?, ?, ?)", (role, location, now)
+            )
+            self._conn.commit()
+
+    def recent_jobs(self, role, location, limit):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT job_id, url, title, card_text, description, first_seen FROM jobs"
+                " WHERE role = ? AND location = ? ORDER BY first_seen DESC, rowid ASC LIMIT ?",
+                (_normalize(role), _normalize(location), limit),
+            ).fetchall()
+        return [
+            {"job_id": job_id, "url": url, "title": title, "text": text, "description": description,
+             "first_seen": first_seen}
+            for job_id, url, title, text, description, first_seen in rows
+        ]
+
+    def set_descriptions(self, descriptions):
+        # descriptions: {job_id: text}; a job ID's description is the same for every search
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE jobs SET description = ? WHERE job_id = ?",
+                [(text, job_id) for job_id, text in descriptions.items()],
+            )
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM jobs")
+            self._conn.execute("DELETE FROM searches")
+            self._conn.commit()
+
+    def last_run(self, role, location):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT last_run FROM searches WHERE role = ? AND location = ?", (_normalize(role), _normalize(location))
+            ).fetchone()
+        return row[0] if row else None
+
+    def is_fresh(self, role, location, num_jobs, max_age=REFRESH_SECONDS):
+        last_run = self.last_run(role, location)
+        if last_run is None or time.time() - last_run > max_age:
+            return False
+        return len(self.recent_jobs(role, location, num_jobs)) >= num_jobs
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_job_store():
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = JobStore()
+        return _default_store
@@ -0,0 +1,303 @@
+import json
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from urllib.parse import quote_plus
+
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from webdriver_manager.chrome import ChromeDriverManager
+
+from job_store import job_id_from_url
+from telemetry import get_telemetry
+
+# Chrome sessions stay open between searches (and Streamlit sessions) so the
+# manual LinkedIn login happens once. Each pooled browser has its own profile
+# directory (Chrome locks profiles); cookies from whichever one logged in are
+# shared with the others through COOKIE_FILE.
+LINKEDIN_BASE_URL = os.environ.get("LINKEDIN_BASE_URL", "https://www.linkedin.com").rstrip("/")
+PROFILE_DIR = os.environ.get("LINKEDIN_PROFILE_DIR", ".linkedin_profile")
+COOKIE_FILE = os.path.join(PROFILE_DIR, "cookies.json")
+DRIVER_POOL_SIZE = int(os.environ.get("LINKEDIN_DRIVER_POOL_SIZE", "2"))
+HEADLESS = os.environ.get("LINKEDIN_HEADLESS", "") == "1"
+PAGE_LOAD_TIMEOUT = 60
+RESULTS_PER_PAGE = 25
+MAX_PAGES = int(os.environ.get("LINKEDIN_MAX_PAGES", "40"))
+LOGIN_TIMEOUT = 600
+# How often a search waiting for a busy pool checks for a free browser (or slot) and cancellation
+POOL_POLL_SECONDS = 1.0
+
+# One round trip: bring every card into view so LinkedIn renders it, then read all links
+HARVEST_CARDS_JS = """
+const cards = Array.from(document.querySelectorAll('.job-card-container'));
+cards.forEach(card => card.scrollIntoView({block: 'nearest'}));
+return cards.map(card => {
+    const link = card.querySelector('a[href*="/jobs/view/"]') || card.querySelector('a');
+    const title = card.querySelector('.job-card-list__title, .job-card-container__link, strong');
+    const holder = card.closest('[data-job-id]') || card.querySelector('[data-job-id]');
+    return {
+        job_id: card.getAttribute('data-job-id') || (holder ? holder.getAttribute('data-job-id') : null),
+        url: link ? link.href : null,
+        title: title ? title.innerText.trim() : '',
+        text: card.innerText,
+    };
+});
+"""
+
+DESCRIPTION_SELECTORS = ".jobs-description__content, .jobs-description, .description__text, #job-details"
+
+COUNT_CARD_LINKS_JS = """
+const cards = Array.from(document.querySelectorAll('.job-card-container'));
+cards.forEach(card => card.scrollIntoView({block: 'nearest'}));
+return [cards.length, cards.filter(card => card.querySelector('a[href*="/jobs/view/"]')).length];
+"""
+
+
+@lru_cache(maxsize=None)
+def chromedriver_path():
+    # Resolved once per process instead of on every search
+    return ChromeDriverManager().install()
+
+
+def search_url(role, location, start=0):
+    url = f"{LINKEDIN_BASE_URL}/jobs/search/?keywords={quote_plus(role)}&location={quote_plus(location)}&sortBy=DD"
+    return url + f"&start={start}" if start else url
+
+
+def is_logged_in(driver):
+    url = driver.current_url
+    return not any(marker in url for marker in ("/login", "/checkpoint", "/authwall", "/uas/"))
+
+
+class DriverPool:
+    def __init__(self, size=DRIVER_POOL_SIZE, profile_dir=PROFILE_DIR):
+        self.size = size
+        self.profile_dir = profile_dir
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._cookie_lock = threading.Lock()
+
+    def _new_driver(self, slot):
+        options = Options()
+        options.add_argument("--start-maximized")
+        options.add_argument(f"--user-data-dir={os.path.abspath(os.path.join(self.profile_dir, f'slot-{slot}'))}")
+        if HEADLESS:
+            options.add_argument("--headless=new")
+        with get_telemetry().span("driver_start", slot=slot):
+            driver = webdriver.Chrome(service=Service(chromedriver_path()), options=options)
+        driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+        driver.pool_slot = slot
+        return driver
+
+    @contextmanager
+    def driver(self, on_poll=None):
+        # on_poll is called about once a second while every browser is busy; it may raise to stop waiting
+        driver = self._acquire(on_poll)
+        try:
+            yield driver
+        except WebDriverException:
+            # A crashed or closed browser is dropped rather than handed to the next search
+            self._discard(driver)
+            raise
+        except BaseException:
+            # e.g. a cancelled search; the browser itself is fine
+            self._idle.put(driver)
+            raise
+        else:
+            self._idle.put(driver)
+
+    def _acquire(self, on_poll=None):
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    slot = self._created if self._created < self.size else None
+                    if slot is not None:
+                        self._created += 1
+                if slot is None:
+                    # Waits a little at a time: a crashed browser frees its slot without
+                    # returning anything to the queue, and the caller may be cancelled
+                    if on_poll:
+                        on_poll()
+                    try:
+                        driver = self._idle.get(timeout=POOL_POLL_SECONDS)
+                    except queue.Empty:
+                        continue
+                else:
+                    try:
+                        return self._new_driver(slot)
+                    except Exception:
+                        with self._lock:
+                            self._created -= 1
+                        raise
+            try:
+                driver.current_url
+                return driver
+            except WebDriverException:
+                self._discard(driver)
+
+    def _discard(self, driver):
+        with self._lock:
+            self._created -= 1
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+
+    def save_cookies(self, driver):
+        with self._cookie_lock:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            with open(COOKIE_FILE, "w", encoding="utf-8") as f:
+                json.dump(driver.get_cookies(), f)
+
+    def load_cookies(self, driver):
+        with self._cookie_lock:
+            if not os.path.exists(COOKIE_FILE):
+                return False
+            with open(COOKIE_FILE, encoding="utf-8") as f:
+                cookies = json.load(f)
+        for cookie in cookies:
+            cookie.pop("sameSite", None)
+            try:
+                driver.add_cookie(cookie)
+            except WebDriverException:
+                pass
+        return True
+
+    def close(self):
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
+
+
+def ensure_logged_in(pool, driver, on_login_required=None, timeout=LOGIN_TIMEOUT, on_poll=None):
+    # on_poll is called about once a second while waiting for a manual login; it may raise to stop waiting
+    with get_telemetry().span("login") as span:
+        driver.get(f"{LINKEDIN_BASE_URL}/feed/")
+        span["cache_hit"] = is_logged_in(driver)
+        if span["cache_hit"]:
+            return
+        # Another pooled browser may already have logged in; try its cookies before asking the user
+        if pool.load_cookies(driver):
+            driver.get(f"{LINKEDIN_BASE_URL}/feed/")
+            span["cache_hit"] = is_logged_in(driver)
+            if span["cache_hit"]:
+                return
+        driver.get(f"{LINKEDIN_BASE_URL}/login")
+        if on_login_required:
+            on_login_required()
+        WebDriverWait(driver, timeout, poll_frequency=1).until(
+            lambda d: (on_poll() if on_poll else None) or is_logged_in(d)
+        )
+        pool.save_cookies(driver)
+
+
+def wait_for_cards(driver, num_jobs, timeout=PAGE_LOAD_TIMEOUT):
+    WebDriverWait(driver, timeout).until(EC.presence_of_all_elements_located((By.CLASS_NAME, "job-card-container")))
+    # Cards render their links lazily; wait until enough have links or the list stops growing
+    last = [None]
+
+    def ready(d):
+        total, linked = d.execute_script(COUNT_CARD_LINKS_JS)
+        settled = last[0] == (total, linked)
+        last[0] = (total, linked)
+        return linked >= min(num_jobs, total) or settled
+
+    WebDriverWait(driver, timeout, poll_frequency=0.5).until(ready)
+
+
+def harvest_job_cards(driver):
+    with get_telemetry().span("harvest_cards") as span:
+        cards = driver.execute_script(HARVEST_CARDS_JS)
+        span["cards"] = len(cards or ())
+    return cards
+
+
+def collect_new_jobs(driver, role, location, num_jobs, known_ids=(), on_progress=None):
+    # Walks result pages (newest first) until num_jobs unseen jobs are collected, the
+    # results run out (a short page), or a page is mostly jobs we already have and the
+    # index already holds enough to fill num_jobs. A page of known jobs with too few in
+    # the index is skipped over to reach older ones, and a single stale promoted card
+    # does not stop the walk. on_progress(page, new jobs so far) is called after each
+    # page; it may raise to stop the walk.
+    new_jobs = []
+    seen = set(known_ids)
+    start = 0
+    for page in range(MAX_PAGES):
+        with get_telemetry().span("page_load", page=page) as span:
+            driver.get(search_url(role, location, start))
+            try:
+                wait_for_cards(driver, RESULTS_PER_PAGE)
+            except TimeoutException:
+                span["error"] = "TimeoutException"
+                break
+        cards = harvest_job_cards(driver)
+        if not cards:
+            break
+        known_on_page = 0
+        for card in cards:
+            job_id = (card.get("job_id") or "").rsplit(":", 1)[-1] or job_id_from_url(card.get("url"))
+            if not job_id or not job_id.isdigit():
+                continue
+            if job_id in seen:
+                known_on_page += job_id in known_ids
+                continue
+            seen.add(job_id)
+            new_jobs.append({
+                "job_id": job_id,
+                "url": f"{LINKEDIN_BASE_URL}/jobs/view/{job_id}/",
+                "title": card.get("title") or "",
+                "text": card.get("text") or "",
+            })
+        if on_progress:
+            on_progress(page + 1, len(new_jobs))
+        if len(new_jobs) >= num_jobs or len(cards) < RESULTS_PER_PAGE:
+            break
+        if known_on_page * 2 >= len(cards) and len(new_jobs) + len(known_ids) >= num_jobs:
+            break
+        start += len(cards)
+    return new_jobs[:num_jobs]
+
+
+def fetch_job_descriptions(driver, jobs, timeout=20, on_progress=None):
+    # One page load and one DOM read per job; callers only pass jobs the index lacks.
+    # on_progress(jobs done) is called before each job and may raise to stop.
+    descriptions = {}
+    for i, job in enumerate(jobs):
+        if on_progress:
+            on_progress(i)
+        with get_telemetry().span("job_description", job_id=job["job_id"]) as span:
+            driver.get(f"{LINKEDIN_BASE_URL}/jobs/view/{job['job_id']}/")
+            try:
+                element = WebDriverWait(driver, timeout).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, DESCRIPTION_SELECTORS))
+                )
+            except TimeoutException:
+                span["error"] = "TimeoutException"
+                continue
+        descriptions[job["job_id"]] = element.get_attribute("innerText").strip()
+    return descriptions
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_driver_pool():
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = DriverPool()
+        return _default_pool
@@ -0,0 +1,77 @@
+import os
+import threading
+
+import httpx
+
+# One HTTP connection pool and one chain per (api key, model) for the whole process.
+# Modules are imported once per server process, so everything here is shared across
+# Streamlit reruns and sessions; building a ChatOpenAI per call costs a new client
+# and a new TLS handshake every time. openai and LangChain are imported on first use
+# so the app's first render does not wait for them.
+MAX_CONNECTIONS = int(os.environ.get("RESUME_ANALYZER_MAX_CONNECTIONS", "32"))
+REQUEST_TIMEOUT = float(os.environ.get("RESUME_ANALYZER_REQUEST_TIMEOUT", "120"))
+
+
+class LLMClientRegistry:
+    def __init__(self, max_connections=MAX_CONNECTIONS, timeout=REQUEST_TIMEOUT):
+        self._lock = threading.RLock()
+        self._http_client = httpx.Client(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=timeout,
+        )
+        self._clients = {}
+        self._chains = {}
+
+    def get_client(self, api_key):
+        # LangChain hands http_client to its async client too, so give it a ready sync client instead.
+        # Retries are left to llm_scheduler, which spaces them out across every caller.
+        client = self._clients.get(api_key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(api_key)
+                if client is None:
+                    import openai
+
+                    client = openai.OpenAI(
+                        api_key=api_key,
+                        base_url=os.environ.get("OPENAI_API_BASE") or None,
+                        http_client=self._http_client,
+                        max_retries=0,
+                    )
+                    self._clients[api_key] = client
+        return client
+
+    def get_chain(self, api_key, model, streaming=False):
+        key = (api_key, model, streaming)
+        chain = self._chains.get(key)
+        if chain is None:
+            with self._lock:
+                chain = self._chains.get(key)
+                if chain is None:
+                    from langchain.chains.question_answering import load_qa_chain
+                    from langchain_community.chat_models import ChatOpenAI
+
+                    client = self.get_client(api_key)
+                    llm = ChatOpenAI(model=model, openai_api_key=api_key, client=client.chat.completions,
+                                     streaming=streaming)
+                    chain = load_qa_chain(llm=llm, chain_type="stuff")
+                    self._chains[key] = chain
+        return chain
+
+    def close(self):
+        with self._lock:
+            self._chains.clear()
+            self._clients.clear()
+            self._http_client.close()
+
+
+_default_registry = None
+_default_registry_lock = threading.Lock()
+
+
+def get_registry():
+    global _default_registry
+    with _default_registry_lock:
+        if _default_registry is None:
+            _default_registry = LLMClientRegistry()
+        return _default_registry
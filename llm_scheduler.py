@@ -0,0 +1,200 @@
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future
+
+# Every chat and embedding request in the process goes through one scheduler per model,
+# shared by all its Streamlit sessions, worker threads and background tasks. Two token buckets
+# keep requests and tokens per minute inside the account's quota, interactive callers
+# are let through before batch work while both wait for quota, 429s and 5xx errors are
+# retried with exponential backoff and jitter (honouring Retry-After), and identical
+# requests already in flight are sent once and shared. All of this is per process: the
+# bulk CLI or a second server instance has its own buckets, so each needs its own share
+# of the account's limits (RESUME_ANALYZER_RPM / RESUME_ANALYZER_TPM).
+REQUESTS_PER_MINUTE = int(os.environ.get("RESUME_ANALYZER_RPM", "3500"))
+TOKENS_PER_MINUTE = int(os.environ.get("RESUME_ANALYZER_TPM", "90000"))
+MAX_RETRIES = int(os.environ.get("RESUME_ANALYZER_MAX_RETRIES", "6"))
+# OpenAI enforces per-minute limits over shorter windows, so only a few seconds' worth may go out at once
+BURST_SECONDS = 10
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 60.0
+
+# Lower goes first
+INTERACTIVE = 0
+BATCH = 1
+
+_priority = threading.local()
+
+
+def set_priority(level):
+    # Also usable as a ThreadPoolExecutor initializer, so a pool's workers inherit it
+    _priority.level = level
+
+
+def current_priority():
+    return getattr(_priority, "level", INTERACTIVE)
+
+
+def is_retryable(error):
+    import openai
+
+    if isinstance(error, openai.APIConnectionError):
+        return True  # includes timeouts
+    if isinstance(error, openai.RateLimitError):
+        # An exhausted balance is also a 429, but waiting will not fix it
+        return getattr(error, "code", None) != "insufficient_quota"
+    return isinstance(error, openai.APIStatusError) and error.status_code >= 500
+
+
+def _retry_after(error):
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    try:
+        if "retry-after-ms" in response.headers:
+            return float(response.headers["retry-after-ms"]) / 1000
+        return float(response.headers["retry-after"])
+    except (KeyError, ValueError):
+        return None  # absent, or given as an HTTP date
+
+
+class TokenBucket:
+    # Holds up to burst_seconds' allowance and refills continuously. Not locked; the
+    # scheduler only touches it under its own lock.
+    def __init__(self, per_minute, burst_seconds=BURST_SECONDS):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self, amount):
+        # Seconds until amount can be taken; a request larger than the bucket waits for a full one
+        self._refill()
+        return max(0.0, (min(amount, self.capacity) - self.level) / self.rate)
+
+    def take(self, amount):
+        self._refill()
+        self.level -= min(amount, self.capacity)
+
+    def refund(self, amount):
+        # A negative amount charges for tokens used beyond the estimate
+        self._refill()
+        self.level = min(self.capacity, self.level + amount)
+
+
+class RateLimitScheduler:
+    def __init__(self, requests_per_minute=REQUESTS_PER_MINUTE, tokens_per_minute=TOKENS_PER_MINUTE,
+                 max_retries=MAX_RETRIES):
+        self.max_retries = max_retries
+        self._requests = TokenBucket(requests_per_minute)
+        self._tokens = TokenBucket(tokens_per_minute)
+        self._cond = threading.Condition()
+        self._waiting = []
+        self._tickets = itertools.count()
+        self._paused_until = 0.0
+        self._in_flight = {}
+        self._in_flight_lock = threading.Lock()
+
+    def acquire(self, tokens, priority=None):
+        # Blocks until this caller is first in line (by priority, then arrival) and both
+        # buckets allow it; returns the seconds spent waiting
+        ticket = (current_priority() if priority is None else priority, next(self._tickets))
+        start = time.monotonic()
+        with self._cond:
+            heapq.heappush(self._waiting, ticket)
+            self._cond.notify_all()
+            try:
+                while True:
+                    if self._waiting[0] != ticket:
+                        self._cond.wait()
+                        continue
+                    delay = max(self._paused_until - time.monotonic(), self._requests.delay(1), self._tokens.delay(tokens))
+                    if delay <= 0:
+                        self._requests.take(1)
+                        self._tokens.take(tokens)
+                        return time.monotonic() - start
+                    self._cond.wait(delay)
+            finally:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._cond.notify_all()
+
+    def record_usage(self, estimated_tokens, actual_tokens):
+        with self._cond:
+            self._tokens.refund(estimated_tokens - actual_tokens)
+            self._cond.notify_all()
+
+    def backoff(self, attempt, error):
+        delay = _retry_after(error)
+        if delay is None:
+            ceiling = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt)
+            delay = ceiling / 2 + random.uniform(0, ceiling / 2)
+        delay = min(delay, BACKOFF_MAX_SECONDS)
+        if getattr(error, "status_code", None) == 429:
+            # The quota is shared, so everyone waits rather than each caller finding out separately
+            with self._cond:
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        return delay
+
+    def call(self, send, tokens=0, key=None, priority=None, span=None):
+        # Returns send() once the buckets allow it, retrying transient errors. A caller whose
+        # key matches a call already in flight waits for that call's result instead, and its
+        # span gets coalesced=True. The leader's span gets queue_seconds and retries.
+        if key is not None:
+            with self._in_flight_lock:
+                future = self._in_flight.get(key)
+                leader = future is None
+                if leader:
+                    future = self._in_flight[key] = Future()
+            if not leader:
+                if span is not None:
+                    span["coalesced"] = True
+                return future.result()
+        try:
+            result = self._send(send, tokens, priority, span)
+        except BaseException as e:
+            if key is not None:
+                future.set_exception(e)
+            raise
+        else:
+            if key is not None:
+                future.set_result(result)
+            return result
+        finally:
+            if key is not None:
+                with self._in_flight_lock:
+                    del self._in_flight[key]
+
+    def _send(self, send, tokens, priority, span):
+        for attempt in itertools.count():
+            waited = self.acquire(tokens, priority)
+            if span is not None:
+                span["queue_seconds"] = span.get("queue_seconds", 0.0) + waited
+                span["retries"] = attempt
+            try:
+                return send()
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    raise
+                time.sleep(self.backoff(attempt, e))
+
+
+_default_schedulers = {}
+_default_schedulers_lock = threading.Lock()
+
+
+def get_scheduler(model):
+    # OpenAI enforces its limits per model, so each model gets its own buckets
+    with _default_schedulers_lock:
+        scheduler = _default_schedulers.get(model)
+        if scheduler is None:
+            scheduler = _default_schedulers[model] = RateLimitScheduler()
+        return scheduler
@@ -0,0 +1,661 @@
+import json
+import os
+import queue
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from analysis_cache import content_hash, get_cache
+from chunk_planner import SECTION_RE, budget_for, count_tokens, plan_context
+from document_extraction import iter_documents_text, split_stream
+from fix_lexicon import FIX_CATEGORIES, MAX_DETAILS, detect_fixes
+from llm_client import get_registry
+from llm_scheduler import INTERACTIVE, get_scheduler, set_priority
+from telemetry import estimate_cost, get_telemetry
+from vector_index import rank_chunks
+
+# Resume parsing and LLM analysis, with no Streamlit dependency so the app and
+# the bulk CLI share one pipeline. LangChain is only imported once a query is
+# actually sent, so importing this module for its settings stays cheap.
+OPENAI_MODEL = "gpt-3.5-turbo"
+CHUNK_SIZE = 700
+CHUNK_OVERLAP = 200
+MAX_CONCURRENCY = int(os.environ.get("RESUME_ANALYZER_MAX_CONCURRENCY", "8"))
+ANALYSIS_MODE = os.environ.get("RESUME_ANALYZER_MODE", "structured")
+# "local" finds Top Fixes with fix_lexicon only, "local+llm" adds the LLM's examples to
+# those, and "llm" asks the model alone (the original behaviour)
+FIXES_ENGINE = os.environ.get("RESUME_ANALYZER_FIXES", "local")
+FIXES_ENGINES = ("local", "local+llm", "llm")
+LLM_MAX_IN_FLIGHT = int(os.environ.get("RESUME_ANALYZER_LLM_MAX_IN_FLIGHT", "16"))
+STREAM_POLL_SECONDS = 0.05
+# Reserved against the tokens-per-minute budget for each answer until its real size is known
+COMPLETION_TOKENS_ESTIMATE = 400
+SUPPORTED_EXTENSIONS = (".pdf", ".docx")
+
+ANALYSIS_PROMPTS = {
+    "summary": "Summarize this resume.",
+    "strengths": "What are the strengths in this resume?",
+    "weaknesses": "What are the weaknesses in this resume?",
+    "roles": "Based on this resume, what job roles are suitable?",
+}
+
+# What each prompt should read when a resume is longer than its context budget
+RETRIEVAL_QUERIES = {
+    "summary": "Professional summary, most recent roles, core skills and education",
+    "strengths": "Work experience, achievements, projects and measurable impact",
+    "weaknesses": "Work experience descriptions, responsibilities, gaps and vague statements",
+    "roles": "Technical skills, tools, technologies, certifications and job titles",
+    "score": "Work experience with metrics, technical skills, education and formatting",
+    "fixes": "Bullet points describing work experience and responsibilities",
+    "structured": "Professional summary, work experience with achievements, technical skills and education",
+}
+
+
+# Process-wide cap on concurrent chat requests and a running token tally (the handler is thread-safe)
+_in_flight = threading.BoundedSemaphore(LLM_MAX_IN_FLIGHT)
+_token_usage = None
+_token_usage_lock = threading.Lock()
+
+
+def get_token_usage():
+    global _token_usage
+    with _token_usage_lock:
+        if _token_usage is None:
+            from langchain_community.callbacks.openai_info import OpenAICallbackHandler
+
+            _token_usage = OpenAICallbackHandler()
+        return _token_usage
+
+
+def set_max_in_flight(limit):
+    global _in_flight
+    _in_flight = threading.BoundedSemaphore(limit)
+
+
+def is_supported(name):
+    return name.lower().endswith(SUPPORTED_EXTENSIONS)
+
+
+def documents_to_chunks(documents, use_pool=None):
+    # documents: list of (file name, bytes). Unsupported files come back as ([], "").
+    # Parsed text is cached on the file bytes and chunks on text + chunking settings,
+    # so a re-upload skips parsing and a settings change skips only the parse.
+    results = [([], "")] * len(documents)
+    to_extract = []
+    for i, (name, data) in enumerate(documents):
+        if not is_supported(name):
+            continue
+        text_key = content_hash(data, name.rsplit(".", 1)[-1].lower())
+        chunk_key = content_hash(text_key, CHUNK_SIZE, CHUNK_OVERLAP, "sections")
+        text = get_cache().get("text", text_key)
+        if text is None:
+            to_extract.append((i, name.lower(), data, text_key, chunk_key))
+            continue
+        with get_telemetry().span("resume_to_chunks", document=text_key[:12], cache_hit=True):
+            chunks = get_cache().get("chunks", chunk_key)
+            if chunks is None:
+                chunks = list(split_stream([text], CHUNK_SIZE, CHUNK_OVERLAP, SECTION_RE))
+                get_cache().set("chunks", chunk_key, chunks)
+        results[i] = (chunks, text)
+
+    extracted = iter_documents_text([(name, data) for _, name, data, _, _ in to_extract], use_pool)
+    for (i, name, _, text_key, chunk_key), pieces in zip(to_extract, extracted):
+        with get_telemetry().span("resume_to_chunks", document=text_key[:12], cache_hit=False) as span:
+            seen = []
+            chunks = list(split_stream(_timed_pieces(pieces, seen, span), CHUNK_SIZE, CHUNK_OVERLAP, SECTION_RE))
+            text = "".join(seen)
+            span["pages"] = len(seen)
+            span["chunks"] = len(chunks)
+        get_cache().set("text", text_key, text)
+        get_cache().set("chunks", chunk_key, chunks)
+        results[i] = (chunks, text)
+    return results
+
+
+def _timed_pieces(pieces, seen, span):
+    # Splits the span's time into parsing (waiting on pages) and everything else (chunking)
+    span["parse_seconds"] = 0.0
+    pieces = iter(pieces)
+    while True:
+        start = time.perf_counter()
+        piece = next(pieces, None)
+        span["parse_seconds"] += time.perf_counter() - start
+        if piece is None:
+            return
+        seen.append(piece)
+        yield piece
+
+
+def run_openai_query(api_key, content, prompt, retrieval_query=None, purpose="query", on_token=None):
+    # With on_token the answer is streamed and on_token(text) is called for each new piece
+    # (once with the whole answer on a cache hit). It runs on the calling thread.
+    with get_telemetry().span("llm_query", purpose=purpose, model=OPENAI_MODEL) as span:
+        # Handle string or list input
+        if isinstance(content, str):
+            pages = [content]
+        else:
+            pages = plan_pages(api_key, list(content), retrieval_query, budget_for(purpose), span)
+
+        # Answers are cached on exactly what is sent, so reruns of an unchanged resume are free,
+        # and the same key coalesces identical requests from concurrent sessions
+        key = content_hash(OPENAI_MODEL, prompt, pages)
+        cached = get_cache().get("query", key)
+        span["cache_hit"] = cached is not None
+        if cached is not None:
+            if on_token:
+                on_token(cached)
+            return cached
+
+        from langchain.schema import Document
+        from langchain_community.callbacks.openai_info import OpenAICallbackHandler
+
+        chain = get_registry().get_chain(api_key, OPENAI_MODEL, streaming=on_token is not None)
+        input_documents = [Document(page_content=page) for page in pages]
+        call_usage = OpenAICallbackHandler()
+        callbacks = [get_token_usage(), call_usage]
+        if on_token:
+            forwarder = _token_forwarder(on_token)
+            callbacks.append(forwarder)
+
+        def send():
+            with _in_flight:
+                return chain.run(input_documents=input_documents, question=prompt, callbacks=callbacks)
+
+        scheduler = get_scheduler(OPENAI_MODEL)
+        prompt_estimate = count_tokens(prompt, OPENAI_MODEL) + sum(count_tokens(page, OPENAI_MODEL) for page in pages)
+        estimate = prompt_estimate + COMPLETION_TOKENS_ESTIMATE
+        answer = scheduler.call(send, estimate, key, span=span)
+        if span.get("coalesced"):
+            # Another session sent this exact request; its answer arrives whole
+            if on_token:
+                on_token(answer)
+            return answer
+        if on_token:
+            # Streamed responses carry no usage block: the prompt is counted with the
+            # tokenizer and the completion by its streamed pieces
+            span["prompt_tokens"] = prompt_estimate
+            span["completion_tokens"] = forwarder.tokens
+        else:
+            span["prompt_tokens"] = call_usage.prompt_tokens
+            span["completion_tokens"] = call_usage.completion_tokens
+        span["cost_usd"] = estimate_cost(OPENAI_MODEL, span["prompt_tokens"], span["completion_tokens"])
+        scheduler.record_usage(estimate, (span["prompt_tokens"] or prompt_estimate) + span["completion_tokens"])
+        get_cache().set("query", key, answer)
+        return answer
+
+
+def plan_pages(api_key, chunks, retrieval_query, budget, span):
+    # The whole resume when it fits the budget; otherwise the chunks most relevant to
+    # retrieval_query (or the first ones, without a query or when embedding fails)
+    pages, stats = plan_context(chunks, range(len(chunks)), budget, OPENAI_MODEL, CHUNK_OVERLAP)
+    if retrieval_query and stats["chunks_used"] < len(chunks):
+        try:
+            order = rank_chunks(api_key, chunks, retrieval_query)
+            pages, stats = plan_context(chunks, order, budget, OPENAI_MODEL, CHUNK_OVERLAP)
+        except Exception:
+            pass
+    span.update(stats)
+    return pages
+
+
+def _token_forwarder(on_token):
+    from langchain_core.callbacks import BaseCallbackHandler
+
+    class TokenForwarder(BaseCallbackHandler):
+        tokens = 0
+
+        def on_llm_new_token(self, token, **kwargs):
+            if token:
+                self.tokens += 1
+                on_token(token)
+
+    return TokenForwarder()
+
+
+SCORE_RUBRIC = (
+    "• 90-100: Outstanding resume — excellent technical skills, clear formatting, metrics-backed experience, highly relevant to target jobs.\n"
+    "• 75-89: Strong resume — good clarity, relevant skills and roles, some quantification, minor improvements needed.\n"
+    "• 60-74: Average — acceptable formatting and content but lacks metrics, specificity, or strong action verbs.\n"
+    "• 40-59: Weak — lacks structure, missing key sections, vague or generic experience.\n"
+    "• 0-39: Very poor — not a professional resume.\n"
+)
+
+
+def parse_score(value):
+    # Takes the first number in the reply instead of gluing every digit together ("85/100" -> 85)
+    if isinstance(value, bool):
+        raise ValueError(f"Not a score: {value!r}")
+    if isinstance(value, (int, float)):
+        score = int(round(value))
+    else:
+        match = re.search(r"\d{1,3}", str(value))
+        if not match:
+            raise ValueError(f"No score in {value!r}")
+        score = int(match.group())
+    return min(max(score, 0), 100)
+
+
+def get_strength_score(api_key, chunks):
+    rubric_prompt = (
+        "You are a resume reviewer. Please rate the resume on a scale from 0 to 100 using the rubric below:\n\n"
+        + SCORE_RUBRIC + "\n"
+        "Based on this rubric, provide only a number between 0 and 100. Do not explain or include any other text."
+    )
+    score_text = run_openai_query(api_key, chunks, rubric_prompt, RETRIEVAL_QUERIES["score"], "score")
+    try:
+        return parse_score(score_text)
+    except ValueError:
+        return 70
+
+
+def score_label_and_prompt(score):
+    if score >= 90:
+        return "Excellent", "In 2-3 sentences, explain why this resume is excellent without repeating the summary. Focus on technical skills, education, and experience."
+    elif score >= 75:
+        return "Great", "In 2-3 sentences, explain why this resume is great. Focus on technical skills, education, and core strengths only."
+    elif score >= 60:
+        return "Good", "Briefly explain why this resume is decent but can be improved, in a positive tone. Focus on education and technical skills."
+    else:
+        return "Needs Improvement", "Write 2-3 sentences on why this resume needs improvement, without repeating the summary."
+
+
+def get_score_explanation(api_key, score, summary_text, on_token=None):
+    _, prompt = score_label_and_prompt(score)
+    with get_telemetry().span("get_score_explanation"):
+        return run_openai_query(api_key, [summary_text], prompt, purpose="explanation", on_token=on_token)
+
+
+# Fallback data if the model's answer cannot be parsed
+DEFAULT_FIXES = [
+    {
+        "issue": "Weak Verbs",
+        "score": 7,
+        "details": [
+            {"word": "worked on", "suggestion": "Replace with 'developed', 'implemented', or 'executed'"},
+            {"word": "helped with", "suggestion": "Replace with 'led', 'coordinated', or 'orchestrated'"}
+        ]
+    },
+    {
+        "issue": "Buzzwords",
+        "score": 5,
+        "details": [
+            {"word": "synergy", "suggestion": "Replace with specific collaborative achievements"},
+            {"word": "results-driven", "suggestion": "Include actual metrics and outcomes instead"}
+        ]
+    },
+    {
+        "issue": "Filler Words",
+        "score": 4,
+        "details": [
+            {"word": "very", "suggestion": "Remove or replace with specific descriptors"},
+            {"word": "in order to", "suggestion": "Replace with 'to' for conciseness"}
+        ]
+    },
+    {
+        "issue": "Consistency",
+        "score": 6,
+        "details": [
+            {"word": "Mixed tenses", "suggestion": "Use past tense for previous roles and present for current roles"},
+            {"word": "Inconsistent formatting", "suggestion": "Standardize bullet points, dates, and section headers"}
+        ]
+    }
+]
+
+
+ANALYSIS_SCHEMA = {
+    "type": "object",
+    "required": ["summary", "strengths", "weaknesses", "roles", "score", "fixes"],
+    "properties": {
+        "summary": {"type": "string"},
+        "strengths": {"type": "array", "items": {"type": "string"}},
+        "weaknesses": {"type": "array", "items": {"type": "string"}},
+        "roles": {"type": "array", "items": {"type": "string"}},
+        "score": {"type": "integer", "minimum": 0, "maximum": 100},
+        "fixes": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["issue", "score", "details"],
+                "properties": {
+                    "issue": {"type": "string", "enum": FIX_CATEGORIES},
+                    "score": {"type": "integer", "minimum": 1, "maximum": 10},
+                    "details": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {"word": {"type": "string"}, "suggestion": {"type": "string"}},
+                        },
+                    },
+                },
+            },
+        },
+    },
+}
+
+def _structured_prompt(with_fixes):
+    schema = ANALYSIS_SCHEMA
+    if not with_fixes:
+        schema = {
+            **ANALYSIS_SCHEMA,
+            "required": [field for field in ANALYSIS_SCHEMA["required"] if field != "fixes"],
+            "properties": {field: value for field, value in ANALYSIS_SCHEMA["properties"].items() if field != "fixes"},
+        }
+    prompt = (
+        "You are a resume reviewer. Analyze the resume and answer with a single JSON object and nothing else. "
+        "The object must match this JSON schema:\n" + json.dumps(schema) + "\n\n"
+        "summary: a short summary of the resume. strengths / weaknesses: the main strengths and weaknesses. "
+        "roles: job roles this resume is suitable for. "
+        "score: an overall rating from 0 to 100 using this rubric:\n" + SCORE_RUBRIC
+    )
+    if with_fixes:
+        prompt += (
+            "fixes: exactly these 4 improvement categories: " + ", ".join(FIX_CATEGORIES) + ". "
+            "For each, give a severity score (1-10) and examples with suggestions. "
+            "Weak Verbs: generic verbs that could be replaced with stronger action verbs. "
+            "Buzzwords: overused industry jargon or trendy terms. "
+            "Filler Words: unnecessary words that add no value. "
+            "Consistency: inconsistencies in formatting, tense, or style."
+        )
+    return prompt
+
+
+STRUCTURED_ANALYSIS_PROMPT = _structured_prompt(with_fixes=True)
+# Used when Top Fixes come from fix_lexicon, so the model does not write them out
+STRUCTURED_ANALYSIS_PROMPT_NO_FIXES = _structured_prompt(with_fixes=False)
+
+
+def parse_json_response(raw):
+    # Models like to wrap JSON in code fences or chat around it; keep only the outermost value
+    text = raw.strip()
+    if text.startswith("```"):
+        text = re.sub(r"^```[a-zA-Z]*\s*|\s*```$", "", text)
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+    # Try whichever bracket opens first, so an array of objects is not read as its first object
+    for open_char, close_char in sorted((("{", "}"), ("[", "]")), key=lambda pair: text.find(pair[0]) % (len(text) + 1)):
+        start, end = text.find(open_char), text.rfind(close_char)
+        if start != -1 and end > start:
+            try:
+                return json.loads(text[start:end + 1])
+            except ValueError:
+                continue
+    raise ValueError("No JSON found in model response")
+
+
+def normalize_fixes(fixes):
+    if isinstance(fixes, dict):
+        fixes = fixes.get("fixes", list(fixes.values()))
+    by_issue = {}
+    for fix in fixes if isinstance(fixes, list) else []:
+        if not isinstance(fix, dict) or fix.get("issue") not in FIX_CATEGORIES:
+            continue
+        try:
+            score = min(max(int(fix.get("score", 5)), 1), 10)
+        except (TypeError, ValueError):
+            score = 5
+        details = []
+        for detail in fix.get("details") or []:
+            if isinstance(detail, dict) and detail.get("word"):
+                details.append({"word": str(detail["word"]), "suggestion": str(detail.get("suggestion", "Consider revising"))})
+            elif isinstance(detail, str):
+                details.append({"word": detail, "suggestion": "Consider revising"})
+        by_issue[fix["issue"]] = {"issue": fix["issue"], "score": score, "details": details}
+    if not by_issue:
+        raise ValueError("No usable fixes in model response")
+    # Only the categories the model returned; callers decide how to show the rest
+    return [by_issue[issue] for issue in FIX_CATEGORIES if issue in by_issue]
+
+
+def _as_markdown(value):
+    if isinstance(value, list):
+        return "\n".join(f"- {item}" for item in value if str(item).strip())
+    return str(value).strip()
+
+
+_PARTIAL_STRING = r'"((?:[^"\\]|\\.)*)'
+_SCORE_RE = re.compile(r'"score"\s*:\s*(\d{1,3})\s*[,}\n]')
+
+
+def _decode_partial_string(text):
+    try:
+        return json.loads('"' + text.rstrip("\\") + '"')
+    except ValueError:
+        return text
+
+
+def partial_structured_fields(raw):
+    # Reads whatever fields a structured answer has so far: the summary as it is being
+    # written, list items once they are complete, and the score once its number ends.
+    fields = {}
+    match = re.search(r'"summary"\s*:\s*' + _PARTIAL_STRING, raw)
+    if match and match.group(1):
+        fields["summary"] = _decode_partial_string(match.group(1))
+    for field in ("strengths", "weaknesses", "roles"):
+        match = re.search(r'"%s"\s*:\s*\[([^\]]*)' % field, raw)
+        if match:
+            items = [_decode_partial_string(item) for item in re.findall(_PARTIAL_STRING + '"', match.group(1))]
+            if items:
+                fields[field] = _as_markdown(items)
+    match = _SCORE_RE.search(raw)
+    if match:
+        fields["score"] = parse_score(match.group(1))
+    return fields
+
+
+def repair_analysis(data):
+    # Keeps every field that validates; callers re-ask for whatever is missing
+    result = {}
+    if not isinstance(data, dict):
+        return result
+    for field in ANALYSIS_PROMPTS:
+        value = data.get(field)
+        if value and _as_markdown(value):
+            result[field] = _as_markdown(value)
+    try:
+        result["score"] = parse_score(data["score"])
+    except (KeyError, ValueError):
+        pass
+    try:
+        result["fixes"] = normalize_fixes(data.get("fixes"))
+    except ValueError:
+        pass
+    return result
+
+
+def get_structured_analysis(api_key, chunks, on_token=None, with_fixes=True):
+    prompt = STRUCTURED_ANALYSIS_PROMPT if with_fixes else STRUCTURED_ANALYSIS_PROMPT_NO_FIXES
+    try:
+        result = repair_analysis(parse_json_response(run_openai_query(
+            api_key, chunks, prompt, RETRIEVAL_QUERIES["structured"], "structured", on_token
+        )))
+        if not with_fixes:
+            result.pop("fixes", None)
+        return result
+    except ValueError:
+        return {}
+
+
+def get_resume_fixes(api_key, chunks):
+    prompt = (
+        "Analyze the resume and return a JSON list of exactly these 4 standard improvement categories: "
+        "Weak Verbs, Buzzwords, Filler Words, Consistency. "
+        "For each, provide: issue name, severity score (1-10), examples with suggestions. "
+        "For Weak Verbs: identify generic verbs that could be replaced with stronger action verbs. "
+        "For Buzzwords: identify overused industry jargon or trendy terms. "
+        "For Filler Words: identify unnecessary words that add no value. "
+        "For Consistency: identify any inconsistencies in formatting, tense, or style. "
+        "Format: [{\"issue\": \"Weak Verbs\", \"score\": 6, \"details\": [{\"word\": \"helped with\", \"suggestion\": \"Replace with 'spearheaded' or 'led'\"}]}]"
+    )
+    with get_telemetry().span("get_resume_fixes") as span:
+        raw = run_openai_query(api_key, chunks, prompt, RETRIEVAL_QUERIES["fixes"], "fixes")
+        try:
+            return normalize_fixes(parse_json_response(raw))
+        except ValueError as e:
+            span["fallback"] = type(e).__name__
+            return DEFAULT_FIXES
+
+
+def merge_fixes(local, extra):
+    # Local findings come first; the LLM adds examples the lexicon has no entry for, in
+    # the categories it actually returned
+    merged = []
+    extra = {fix["issue"]: fix for fix in extra}
+    for fix in local:
+        other = extra.get(fix["issue"])
+        if other is None:
+            merged.append(fix)
+            continue
+        seen = {detail["word"].split(" (×")[0].lower() for detail in fix["details"]}
+        details = fix["details"] + [detail for detail in other["details"] if detail["word"].lower() not in seen]
+        merged.append({"issue": fix["issue"], "score": max(fix["score"], other["score"]), "details": details[:MAX_DETAILS]})
+    return merged
+
+
+def enrich_fixes(api_key, chunks, local):
+    fixes = get_resume_fixes(api_key, chunks)
+    return local if fixes is DEFAULT_FIXES else merge_fixes(local, fixes)
+
+
+def describe_error(error):
+    import openai
+
+    if isinstance(error, openai.RateLimitError) and getattr(error, "code", None) == "insufficient_quota":
+        return "the OpenAI account has run out of quota"
+    if isinstance(error, openai.RateLimitError):
+        return "the OpenAI API is rate limiting this account; try again in a minute"
+    if isinstance(error, (openai.APIConnectionError, openai.InternalServerError)):
+        return "the OpenAI API is unavailable; try again shortly"
+    return f"{type(error).__name__}: {error}"
+
+
+def analyze_resumes(api_key, resumes, max_workers=MAX_CONCURRENCY, mode=ANALYSIS_MODE, explain=True, on_partial=None,
+                    texts=None, fixes=FIXES_ENGINE, priority=INTERACTIVE, on_poll=None):
+    # Fans every independent LLM call for every resume out over a bounded pool and
+    # yields (file name, field, value) as soon as each one finishes. The gauge
+    # explanation needs the summary and score, so it is queued once both are in.
+    # In "structured" mode one JSON call covers every field; anything it gets
+    # wrong falls back to the dedicated prompt for that field.
+    # With on_partial, text answers are streamed and on_partial(file name, field, value
+    # so far) is called on the consuming thread between yields.
+    # Unless fixes is "llm", Top Fixes are found locally in each resume's full text
+    # (texts, or the joined chunks) and are yielded before any LLM call returns.
+    # A call that still fails after the scheduler's retries is not replaced with a default:
+    # (file name, "errors", {field: message}) is yielded instead, and the field is missing.
+    # priority (llm_scheduler.INTERACTIVE or BATCH) orders this run's requests against others.
+    # on_poll() is called on the consuming thread at least every STREAM_POLL_SECONDS while
+    # waiting; an exception it raises (a cancelled task) stops the run.
+    pending = {}
+    partial = {name: {} for name in resumes}
+    tokens = queue.Queue()
+    streamed = {}
+    shown = {}
+    llm_fields = list(ANALYSIS_PROMPTS) + ["score"] + (["fixes"] if fixes == "llm" else [])
+    local_fixes = {}
+    if fixes != "llm":
+        for name, chunks in resumes.items():
+            local_fixes[name] = detect_fixes((texts or {}).get(name) or "\n".join(chunks))
+
+    def stream_to(name, field):
+        if on_partial is None:
+            return None
+        return lambda token: tokens.put((name, field, token))
+
+    def flush_tokens():
+        changed = set()
+        while True:
+            try:
+                name, field, token = tokens.get_nowait()
+            except queue.Empty:
+                break
+            streamed[name, field] = streamed.get((name, field), "") + token
+            changed.add((name, field))
+        for name, field in changed:
+            if field == "structured":
+                updates = partial_structured_fields(streamed[name, field])
+            else:
+                updates = {field: streamed[name, field]}
+            for key, value in updates.items():
+                if key not in partial[name] and shown.get((name, key)) != value:
+                    shown[name, key] = value
+                    on_partial(name, key, value)
+
+    def submit_field(pool, name, field):
+        chunks = resumes[name]
+        if field == "score":
+            future = pool.submit(get_strength_score, api_key, chunks)
+        elif field == "fixes" and name in local_fixes:
+            future = pool.submit(enrich_fixes, api_key, chunks, local_fixes[name])
+        elif field == "fixes":
+            future = pool.submit(get_resume_fixes, api_key, chunks)
+        else:
+            future = pool.submit(run_openai_query, api_key, chunks, ANALYSIS_PROMPTS[field], RETRIEVAL_QUERIES[field],
+                                 field, stream_to(name, field))
+        pending[future] = (name, field)
+
+    pool = ThreadPoolExecutor(max_workers=max_workers, initializer=set_priority, initargs=(priority,))
+    try:
+        for name, chunks in resumes.items():
+            if mode == "structured":
+                pending[pool.submit(get_structured_analysis, api_key, chunks, stream_to(name, "structured"),
+                                    fixes == "llm")] = (name, None)
+            else:
+                for field in llm_fields:
+                    submit_field(pool, name, field)
+            if fixes == "local+llm":
+                submit_field(pool, name, "fixes")
+
+        for name, value in local_fixes.items():
+            if fixes == "local":
+                partial[name]["fixes"] = value
+                yield name, "fixes", value
+            elif on_partial:
+                on_partial(name, "fixes", value)
+
+        while pending:
+            done, _ = wait(pending, timeout=STREAM_POLL_SECONDS if on_partial or on_poll else None,
+                           return_when=FIRST_COMPLETED)
+            if on_poll:
+                on_poll()
+            if on_partial:
+                flush_tokens()
+            for future in done:
+                name, field = pending.pop(future)
+                if future.exception() is not None:
+                    errors = partial[name].setdefault("errors", {})
+                    errors[field or "analysis"] = describe_error(future.exception())
+                    yield name, "errors", dict(errors)
+                    if field == "fixes" and name in local_fixes:
+                        # Only the LLM's extra examples are lost; the lexicon's findings stand
+                        partial[name]["fixes"] = local_fixes[name]
+                        yield name, "fixes", local_fixes[name]
+                    continue
+                if field is None:
+                    results = future.result()
+                    for missing in llm_fields:
+                        if missing not in results:
+                            submit_field(pool, name, missing)
+                else:
+                    results = {field: future.result()}
+                for field, value in results.items():
+                    partial[name][field] = value
+                    if explain and field in ("summary", "score") and "summary" in partial[name] and "score" in partial[name]:
+                        explanation = pool.submit(get_score_explanation, api_key, partial[name]["score"],
+                                                  partial[name]["summary"], stream_to(name, "explanation"))
+                        pending[explanation] = (name, "explanation")
+                    yield name, field, value
+    finally:
+        # A consumer that stops early (a cancelled task) does not wait for calls still queued
+        # or in flight; requests already sent finish in the background and are cached
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def analyze_resume(api_key, chunks, mode=ANALYSIS_MODE, explain=False, text=None, fixes=FIXES_ENGINE,
+                   priority=INTERACTIVE):
+    result = {}
+    for _, field, value in analyze_resumes(api_key, {"resume": chunks}, len(ANALYSIS_PROMPTS) + 2, mode, explain,
+                                           texts={"resume": text}, fixes=fixes, priority=priority):
+        result[field] = value
+    return result
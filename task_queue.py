@@ -0,0 +1,339 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+# Long-running work (resume analysis, LinkedIn searches) runs on a pool of worker
+# threads instead of the Streamlit script thread, so a session stays responsive and
+# many sessions share one server. Tasks and their uploaded files are kept in SQLite:
+# a page refresh finds finished results again, and tasks left behind by a stopped
+# server are queued again by the next one. Progress is kept in memory while a task
+# runs (the UI polls it) and written through to the database about once a second.
+TASK_DB_PATH = os.environ.get("RESUME_ANALYZER_TASK_DB", "resume_tasks.sqlite3")
+TASK_WORKERS = int(os.environ.get("RESUME_ANALYZER_TASK_WORKERS", "4"))
+TASK_TTL_SECONDS = int(os.environ.get("RESUME_ANALYZER_TASK_TTL_DAYS", "7")) * 24 * 3600
+FLUSH_SECONDS = 1.0
+HEARTBEAT_SECONDS = 10.0
+IDLE_POLL_SECONDS = 2.0
+
+FINISHED = ("done", "failed", "cancelled")
+
+logger = logging.getLogger(__name__)
+
+# kind -> handler(context, **params), returning the task's JSON-serializable result
+_handlers = {}
+
+
+def register_handler(kind, handler):
+    _handlers[kind] = handler
+
+
+class TaskCancelled(Exception):
+    pass
+
+
+class TaskContext:
+    # Handed to a handler. report() is also a cancellation point: it raises
+    # TaskCancelled once the task has been cancelled.
+    def __init__(self, queue, task_id):
+        self.queue = queue
+        self.task_id = task_id
+
+    def files(self):
+        return self.queue.files(self.task_id)
+
+    def check(self):
+        if self.queue.cancel_requested(self.task_id):
+            raise TaskCancelled()
+
+    def report(self, progress=None, message=None, partial=None):
+        self.check()
+        self.queue._report(self.task_id, progress, message, partial)
+
+
+class TaskQueue:
+    def __init__(self, path=TASK_DB_PATH, workers=TASK_WORKERS, ttl_seconds=TASK_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        # Identifies this server process; its heartbeat tells others its running tasks are alive
+        self.instance_id = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            " id TEXT PRIMARY KEY,"
+            " kind TEXT NOT NULL,"
+            " owner TEXT,"
+            " key TEXT,"
+            " params TEXT NOT NULL,"
+            " status TEXT NOT NULL,"
+            " progress REAL NOT NULL DEFAULT 0,"
+            " message TEXT,"
+            " partial TEXT,"
+            " result TEXT,"
+            " error TEXT,"
+            " cancel_requested INTEGER NOT NULL DEFAULT 0,"
+            " instance_id TEXT,"
+            " created_at REAL NOT NULL,"
+            " started_at REAL,"
+            " finished_at REAL);"
+            "CREATE INDEX IF NOT EXISTS tasks_owner ON tasks (owner, created_at DESC);"
+            "CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, created_at);"
+            "CREATE TABLE IF NOT EXISTS task_files ("
+            " task_id TEXT NOT NULL,"
+            " position INTEGER NOT NULL,"
+            " name TEXT NOT NULL,"
+            " data BLOB NOT NULL,"
+            " PRIMARY KEY (task_id, position));"
+            "CREATE TABLE IF NOT EXISTS task_instances ("
+            " id TEXT PRIMARY KEY,"
+            " heartbeat_at REAL NOT NULL);"
+        )
+        self._conn.commit()
+        # Per running task: the latest progress, message and partial (as JSON, so the handler
+        # can keep changing its dict), and when they were last written
+        self._live = {}
+        self._live_lock = threading.Lock()
+        self._flushed = {}
+        self._cancelled = set()
+        self._cancel_checked = {}
+        # API keys are only kept in memory; a task picked up after a restart falls back to OPENAI_API_KEY
+        self._secrets = {}
+        self._heartbeat()
+        self._threads = [threading.Thread(target=self._maintain, name="task-maintenance", daemon=True)]
+        self._threads += [threading.Thread(target=self._work, name=f"task-worker-{i}", daemon=True) for i in range(workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, kind, params, owner=None, files=(), secrets=None, key=None):
+        # files: (name, bytes) pairs, stored with the task and deleted once it finishes.
+        # secrets are passed to the handler like params but never written to disk. key is
+        # the caller's name for the inputs (e.g. their hash), to recognise a resubmission.
+        task_id = uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO tasks (id, kind, owner, key, params, status, created_at) VALUES (?, ?, ?, ?, ?, 'queued', ?)",
+                (task_id, kind, owner, key, json.dumps(params), time.time()),
+            )
+            self._conn.executemany(
+                "INSERT INTO task_files (task_id, position, name, data) VALUES (?, ?, ?, ?)",
+                [(task_id, i, name, sqlite3.Binary(data)) for i, (name, data) in enumerate(files)],
+            )
+            self._conn.commit()
+            if secrets:
+                self._secrets[task_id] = secrets
+        with self._wakeup:
+            self._wakeup.notify()
+        return task_id
+
+    def get(self, task_id):
+        with self._lock:
+            cursor = self._conn.execute("SELECT * FROM tasks WHERE id = ?", (task_id,))
+            row = cursor.fetchone()
+            columns = [column[0] for column in cursor.description]
+        return self._as_task(dict(zip(columns, row))) if row else None
+
+    def tasks(self, owner, kind=None, limit=20):
+        # Newest first
+        query = "SELECT id FROM tasks WHERE owner = ?" + (" AND kind = ?" if kind else "") + " ORDER BY created_at DESC LIMIT ?"
+        with self._lock:
+            ids = [row[0] for row in self._conn.execute(query, (owner, kind, limit) if kind else (owner, limit))]
+        return [task for task in map(self.get, ids) if task]
+
+    def latest(self, owner, kind):
+        tasks = self.tasks(owner, kind, limit=1)
+        return tasks[0] if tasks else None
+
+    def cancel(self, task_id):
+        # A queued task is cancelled at once; a running one stops at its next report()
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE tasks SET status = 'cancelled', finished_at = ? WHERE id = ? AND status = 'queued'", (now, task_id)
+            )
+            if cursor.rowcount:
+                self._conn.execute("DELETE FROM task_files WHERE task_id = ?", (task_id,))
+                self._secrets.pop(task_id, None)
+            else:
+                self._conn.execute("UPDATE tasks SET cancel_requested = 1 WHERE id = ? AND status = 'running'", (task_id,))
+                self._cancelled.add(task_id)
+            self._conn.commit()
+
+    def cancel_requested(self, task_id):
+        if task_id in self._cancelled:
+            return True
+        # Another server process may have cancelled it; look at most once per FLUSH_SECONDS
+        now = time.time()
+        if now - self._cancel_checked.get(task_id, 0) < FLUSH_SECONDS:
+            return False
+        self._cancel_checked[task_id] = now
+        with self._lock:
+            row = self._conn.execute("SELECT cancel_requested FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        if row and row[0]:
+            self._cancelled.add(task_id)
+        return task_id in self._cancelled
+
+    def files(self, task_id):
+        with self._lock:
+            return [(name, bytes(data)) for name, data in self._conn.execute(
+                "SELECT name, data FROM task_files WHERE task_id = ? ORDER BY position", (task_id,)
+            )]
+
+    def _as_task(self, row):
+        if row["status"] == "running":
+            with self._live_lock:
+                row.update(self._live.get(row["id"], {}))
+        for field in ("params", "partial", "result"):
+            row[field] = json.loads(row[field]) if row[field] else None
+        row["cancel_requested"] = bool(row["cancel_requested"])
+        return row
+
+    def _report(self, task_id, progress, message, partial):
+        with self._live_lock:
+            live = self._live.setdefault(task_id, {})
+            for field, value in (("progress", progress), ("message", message)):
+                if value is not None:
+                    live[field] = value
+            if partial is not None:
+                live["partial"] = json.dumps(partial)
+        if time.time() - self._flushed.get(task_id, 0) >= FLUSH_SECONDS:
+            try:
+                self._flush(task_id)
+            except sqlite3.Error:
+                # Progress is still served from memory; the next report writes it again
+                logger.warning("Could not save progress of task %s", task_id, exc_info=True)
+                self._rollback()
+
+    def _flush(self, task_id):
+        with self._live_lock:
+            live = dict(self._live.get(task_id, {}))
+        self._flushed[task_id] = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE tasks SET progress = COALESCE(?, progress), message = COALESCE(?, message),"
+                " partial = COALESCE(?, partial) WHERE id = ?",
+                (live.get("progress"), live.get("message"), live.get("partial"), task_id),
+            )
+            self._conn.commit()
+
+    def _rollback(self):
+        # Every write commits before releasing the lock, so anything open here is a failed write
+        with self._lock:
+            self._conn.rollback()
+
+    def _claim(self):
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "UPDATE tasks SET status = 'running', instance_id = ?, started_at = ?"
+                    " WHERE id = (SELECT id FROM tasks WHERE status = 'queued' ORDER BY created_at LIMIT 1)"
+                    " AND status = 'queued' RETURNING id, kind, params",
+                    (self.instance_id, time.time()),
+                ).fetchone()
+                self._conn.commit()
+            except sqlite3.Error:
+                # Otherwise a later commit on the shared connection would claim a task nobody runs
+                self._conn.rollback()
+                raise
+        return row
+
+    def _work(self):
+        # Database errors (e.g. "database is locked" while other instances write) are
+        # logged and retried; a worker that stopped would leave queued tasks waiting forever
+        while True:
+            try:
+                claimed = self._claim()
+            except Exception:
+                logger.exception("Could not claim a task")
+                claimed = None
+            if claimed is None:
+                # Also picks up tasks queued by other server processes
+                with self._wakeup:
+                    self._wakeup.wait(IDLE_POLL_SECONDS)
+                continue
+            task_id, kind, params = claimed
+            status, result, error = "done", None, None
+            try:
+                handler = _handlers.get(kind)
+                if handler is None:
+                    raise LookupError(f"No handler for {kind!r} tasks")
+                result = handler(TaskContext(self, task_id), **json.loads(params), **self._secrets.get(task_id, {}))
+            except TaskCancelled:
+                status = "cancelled"
+            except Exception as e:
+                status, error = "failed", f"{type(e).__name__}: {e}"
+            while True:
+                try:
+                    self._finish(task_id, status, result, error)
+                    break
+                except Exception:
+                    logger.exception("Could not save the outcome of task %s", task_id)
+                    self._rollback()
+                    time.sleep(IDLE_POLL_SECONDS)
+
+    def _finish(self, task_id, status, result, error):
+        self._flush(task_id)
+        with self._lock:
+            self._conn.execute(
+                "UPDATE tasks SET status = ?, result = ?, error = ?, finished_at = ?,"
+                " progress = CASE WHEN ? = 'done' THEN 1 ELSE progress END WHERE id = ?",
+                (status, json.dumps(result) if result is not None else None, error, time.time(), status, task_id),
+            )
+            self._conn.execute("DELETE FROM task_files WHERE task_id = ?", (task_id,))
+            self._conn.commit()
+            for state in (self._flushed, self._cancel_checked, self._secrets):
+                state.pop(task_id, None)
+        with self._live_lock:
+            self._live.pop(task_id, None)
+            self._cancelled.discard(task_id)
+
+    def _heartbeat(self):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO task_instances (id, heartbeat_at) VALUES (?, ?)", (self.instance_id, now)
+            )
+            # Tasks whose server stopped mid-run are queued again (or closed, if they were being cancelled)
+            stale = now - 3 * HEARTBEAT_SECONDS
+            self._conn.execute(
+                "UPDATE tasks SET status = CASE WHEN cancel_requested THEN 'cancelled' ELSE 'queued' END,"
+                " instance_id = NULL WHERE status = 'running' AND instance_id NOT IN"
+                " (SELECT id FROM task_instances WHERE heartbeat_at >= ?)",
+                (stale,),
+            )
+            self._conn.execute("DELETE FROM task_instances WHERE heartbeat_at < ?", (stale,))
+            expired = now - self.ttl_seconds
+            self._conn.execute(
+                "DELETE FROM task_files WHERE task_id IN (SELECT id FROM tasks WHERE finished_at < ?)", (expired,)
+            )
+            self._conn.execute("DELETE FROM tasks WHERE finished_at < ?", (expired,))
+            self._conn.commit()
+
+    def _maintain(self):
+        # Keeps going through database errors: without heartbeats other instances would
+        # queue this one's running tasks again and run them twice
+        while True:
+            time.sleep(HEARTBEAT_SECONDS)
+            try:
+                self._heartbeat()
+            except Exception:
+                logger.exception("Could not record the heartbeat")
+                self._rollback()
+            with self._wakeup:
+                self._wakeup.notify_all()
+
+
+_default_queue = None
+_default_queue_lock = threading.Lock()
+
+
+def get_task_queue():
+    global _default_queue
+    with _default_queue_lock:
+        if _default_queue is None:
+            _default_queue = TaskQueue()
+        return _default_queue
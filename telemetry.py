@@ -0,0 +1,141 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Process-wide timing and cost records for the hot paths (parsing, every LLM call,
+# each scrape phase). Records are kept in memory for the sidebar panel and, when
+# RESUME_ANALYZER_TELEMETRY_FILE is set, appended there as JSON lines so several
+# instances can be aggregated. Records are shared by every session, so they carry no
+# file names (documents are identified by a content hash prefix), and only an admin
+# deployment (RESUME_ANALYZER_TELEMETRY_ADMIN=1) offers to clear them.
+TELEMETRY_FILE = os.environ.get("RESUME_ANALYZER_TELEMETRY_FILE")
+TELEMETRY_ADMIN = os.environ.get("RESUME_ANALYZER_TELEMETRY_ADMIN", "") == "1"
+MAX_RECORDS = int(os.environ.get("RESUME_ANALYZER_TELEMETRY_MAX_RECORDS", "10000"))
+
+# USD per 1K tokens: (prompt, completion)
+MODEL_PRICES = {
+    "gpt-3.5-turbo": (0.0005, 0.0015),
+    "gpt-4o-mini": (0.00015, 0.0006),
+    "gpt-4o": (0.0025, 0.01),
+    "text-embedding-3-small": (0.00002, 0.0),
+    "text-embedding-3-large": (0.00013, 0.0),
+    "text-embedding-ada-002": (0.0001, 0.0),
+}
+
+_COUNTERS = ("prompt_tokens", "completion_tokens", "cost_usd", "retries", "tokens_saved", "queue_seconds", "coalesced")
+
+
+def estimate_cost(model, prompt_tokens, completion_tokens=0):
+    prompt_price, completion_price = MODEL_PRICES.get(model, (0.0, 0.0))
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1000
+
+
+class Telemetry:
+    def __init__(self, max_records=MAX_RECORDS, sink_path=TELEMETRY_FILE):
+        self._records = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+        self._sink_path = sink_path
+
+    @contextmanager
+    def span(self, stage, **tags):
+        # Callers may add tokens, cost_usd, retries, queue_seconds or cache_hit to the yielded record
+        record = {"stage": stage, **tags}
+        start = time.perf_counter()
+        record["timestamp"] = time.time()
+        try:
+            yield record
+        except BaseException as e:
+            record["error"] = type(e).__name__
+            raise
+        finally:
+            record["seconds"] = time.perf_counter() - start
+            self.add(record)
+
+    def add(self, record):
+        with self._lock:
+            self._records.append(record)
+            if self._sink_path:
+                with open(self._sink_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record, default=str) + "\n")
+
+    def records(self):
+        with self._lock:
+            return list(self._records)
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+    def summary(self):
+        # One row per (stage, purpose), for the sidebar table
+        groups = {}
+        for record in self.records():
+            key = (record["stage"], record.get("purpose", ""))
+            group = groups.setdefault(key, {"seconds": [], "cache_hits": 0, "errors": 0,
+                                            **{counter: 0 for counter in _COUNTERS}})
+            group["seconds"].append(record["seconds"])
+            group["cache_hits"] += bool(record.get("cache_hit"))
+            group["errors"] += "error" in record
+            for counter in _COUNTERS:
+                group[counter] += record.get(counter) or 0
+        rows = []
+        for (stage, purpose), group in sorted(groups.items()):
+            seconds = sorted(group.pop("seconds"))
+            rows.append({
+                "stage": stage,
+                "purpose": purpose,
+                "count": len(seconds),
+                "mean_ms": round(sum(seconds) / len(seconds) * 1000, 1),
+                "p95_ms": round(seconds[min(len(seconds) - 1, int(len(seconds) * 0.95))] * 1000, 1),
+                **group,
+            })
+        return rows
+
+    def to_jsonl(self):
+        return "".join(json.dumps(record, default=str) + "\n" for record in self.records())
+
+    def to_prometheus(self):
+        lines = [
+            "# HELP resume_analyzer_stage_seconds Wall time spent per stage.",
+            "# TYPE resume_analyzer_stage_seconds summary",
+        ]
+        rows = self.summary()
+        totals = {}
+        for record in self.records():
+            key = (record["stage"], record.get("purpose", ""))
+            totals[key] = totals.get(key, 0.0) + record["seconds"]
+        for row in rows:
+            labels = f'stage="{row["stage"]}",purpose="{row["purpose"]}"'
+            lines.append(f"resume_analyzer_stage_seconds_sum{{{labels}}} {totals[(row['stage'], row['purpose'])]:.6f}")
+            lines.append(f"resume_analyzer_stage_seconds_count{{{labels}}} {row['count']}")
+        for metric, field, help_text in (
+            ("resume_analyzer_prompt_tokens_total", "prompt_tokens", "Prompt tokens sent."),
+            ("resume_analyzer_completion_tokens_total", "completion_tokens", "Completion tokens received."),
+            ("resume_analyzer_cost_usd_total", "cost_usd", "Estimated spend in USD."),
+            ("resume_analyzer_retries_total", "retries", "HTTP retries of LLM requests."),
+            ("resume_analyzer_queue_seconds_total", "queue_seconds", "Time LLM requests waited for rate-limit budget."),
+            ("resume_analyzer_coalesced_total", "coalesced", "LLM requests answered by an identical request in flight."),
+            ("resume_analyzer_tokens_saved_total", "tokens_saved", "Prompt tokens saved by removing chunk overlap."),
+            ("resume_analyzer_cache_hits_total", "cache_hits", "Results served from the local cache."),
+            ("resume_analyzer_errors_total", "errors", "Stages that raised."),
+        ):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for row in rows:
+                lines.append(f'{metric}{{stage="{row["stage"]}",purpose="{row["purpose"]}"}} {row[field]}')
+        return "\n".join(lines) + "\n"
+
+
+_default_telemetry = None
+_default_telemetry_lock = threading.Lock()
+
+
+def get_telemetry():
+    global _default_telemetry
+    with _default_telemetry_lock:
+        if _default_telemetry is None:
+            _default_telemetry = Telemetry()
+        return _default_telemetry
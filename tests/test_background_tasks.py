@@ -0,0 +1,20 @@
+import pytest
+
+import background_tasks
+from llm_scheduler import BATCH, INTERACTIVE
+
+
+@pytest.mark.parametrize("count, priority", [(1, INTERACTIVE), (2, INTERACTIVE), (3, BATCH), (10, BATCH)])
+def test_large_uploads_run_at_batch_priority(monkeypatch, count, priority):
+    seen = []
+
+    def analyze_resumes(api_key, resumes, *args, priority, **kwargs):
+        seen.append(priority)
+        return iter(())
+
+    monkeypatch.setattr(background_tasks, "BATCH_UPLOAD_FILES", 3)
+    monkeypatch.setattr(background_tasks, "documents_to_chunks", lambda files: [(["chunk"], "text") for _ in files])
+    monkeypatch.setattr(background_tasks, "analyze_resumes", analyze_resumes)
+    files = [(f"resume-{i}.pdf", b"") for i in range(count)]
+    background_tasks.analyze_uploads(files, "structured", "local", api_key="key")
+    assert seen == [priority]
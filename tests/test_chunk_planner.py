@@ -0,0 +1,53 @@
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+from chunk_planner import SECTION_RE, count_tokens, overlap_length, plan_context
+
+MODEL = "gpt-3.5-turbo"
+TEXT = " ".join(f"Sentence {i} about shipping Python services to production." for i in range(80))
+
+
+def split(text):
+    return RecursiveCharacterTextSplitter(chunk_size=700, chunk_overlap=200).split_text(text)
+
+
+def test_overlap_length():
+    assert overlap_length("abc def", "def ghi", 10) == 3
+    assert overlap_length("abc def", "def ghi", 2) == 0
+    assert overlap_length("abc", "xyz", 10) == 0
+
+
+def test_all_chunks_rebuild_the_text_without_overlap():
+    chunks = split(TEXT)
+    pages, stats = plan_context(chunks, range(len(chunks)), 10 ** 6, MODEL, 200)
+    assert pages == [TEXT]
+    assert stats["chunks_used"] == stats["chunks_total"] == len(chunks)
+    assert stats["context_tokens"] == count_tokens(TEXT, MODEL)
+    assert stats["tokens_saved"] == sum(count_tokens(chunk, MODEL) for chunk in chunks) - stats["context_tokens"]
+    assert stats["tokens_saved"] > 0
+
+
+def test_non_adjacent_chunks_are_separate_pages_in_document_order():
+    chunks = split(TEXT)
+    pages, stats = plan_context(chunks, [4, 0, 2], 10 ** 6, MODEL, 200)
+    assert pages == [chunks[0], chunks[2], chunks[4]]
+    assert stats["tokens_saved"] == 0
+
+
+def test_budget_keeps_most_useful_chunks():
+    chunks = split(TEXT)
+    budget = count_tokens(chunks[3], MODEL) + 1
+    pages, stats = plan_context(chunks, [3, 0, 1, 2], budget, MODEL, 200)
+    assert pages == [chunks[3]]
+    assert stats["context_tokens"] <= budget
+
+
+def test_first_chunk_is_kept_even_over_budget():
+    chunks = split(TEXT)
+    pages, stats = plan_context(chunks, range(len(chunks)), 1, MODEL, 200)
+    assert pages == [chunks[0]]
+    assert stats["chunks_used"] == 1
+
+
+def test_section_headings():
+    assert SECTION_RE.search("Jane Doe\nWork Experience:\nBuilt things")
+    assert not SECTION_RE.search("Gained experience in Python")
@@ -0,0 +1,40 @@
+import pytest
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+from chunk_planner import SECTION_RE
+from document_extraction import split_stream
+
+CHUNK_SIZE = 700
+CHUNK_OVERLAP = 200
+
+
+def whole_text_split(text):
+    return RecursiveCharacterTextSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP).split_text(text)
+
+
+def pieces(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+SENTENCES = " ".join(f"Sentence {i} about shipping Python services to production." for i in range(300))
+PARAGRAPHS = "\n\n".join(f"Paragraph {i}. " + "Led a team that migrated reports to Spark. " * (i % 5 + 1) for i in range(80))
+
+
+@pytest.mark.parametrize("text", [SENTENCES, PARAGRAPHS, "word " * 3000])
+@pytest.mark.parametrize("piece_size", [97, 1000, 10 ** 6])
+def test_matches_whole_text_split(text, piece_size):
+    assert list(split_stream(pieces(text, piece_size), CHUNK_SIZE, CHUNK_OVERLAP)) == whole_text_split(text)
+
+
+def test_chunks_do_not_span_sections():
+    sections = ["Experience\n" + SENTENCES[:2500], "Skills\n" + "Python, SQL, Spark. " * 60, "Education\nBSc Physics"]
+    text = "\n".join(sections)
+    chunks = list(split_stream(pieces(text, 300), CHUNK_SIZE, CHUNK_OVERLAP, SECTION_RE))
+    for chunk in chunks:
+        assert len(SECTION_RE.findall(chunk)) <= 1
+        assert not SECTION_RE.search(chunk) or SECTION_RE.match(chunk)
+    assert [chunk.split("\n", 1)[0] for chunk in chunks if SECTION_RE.match(chunk)] == ["Experience", "Skills", "Education"]
+
+
+def test_empty_input():
+    assert list(split_stream([], CHUNK_SIZE, CHUNK_OVERLAP)) == []
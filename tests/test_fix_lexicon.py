@@ -0,0 +1,53 @@
+from fix_lexicon import FIX_CATEGORIES, consistency_issues, detect_fixes
+
+
+def _details(text, category):
+    fixes = {fix["issue"]: fix for fix in detect_fixes(text)}
+    return [detail["word"] for detail in fixes[category]["details"]]
+
+
+def test_output_shape():
+    fixes = detect_fixes("Experience\n- Built a very fast pipeline for a team player.\n")
+    assert [fix["issue"] for fix in fixes] == FIX_CATEGORIES
+    assert all(1 <= fix["score"] <= 10 for fix in fixes)
+    assert detect_fixes("")[0] == {"issue": "Weak Verbs", "score": 1, "details": []}
+
+
+def test_weak_verbs_only_at_clause_start():
+    text = "Experience\n- Used Python to ship a dashboard used by 200 analysts.\n- Cut costs and helped with hiring.\n"
+    assert _details(text, "Weak Verbs") == ["Used", "helped with"]
+
+
+def test_repeated_phrases_are_counted():
+    text = "Experience\n- Worked on billing.\n- Worked on search.\n"
+    assert _details(text, "Weak Verbs") == ["Worked on (×2)"]
+
+
+def test_buzzwords_ignored_in_list_sections():
+    text = (
+        "Summary\nA passionate engineer.\n\n"
+        "Skills\nDynamic Programming, Robust Statistics\n\n"
+        "Experience\n- Built pipelines.\nLanguages: Python, dynamic SQL\n"
+    )
+    assert _details(text, "Buzzwords") == ["passionate"]
+
+
+def test_filler_words_count_everywhere():
+    text = "Skills\nPython, SQL, etc\n"
+    assert _details(text, "Filler Words") == ["etc"]
+
+
+def test_tense_checked_per_role():
+    text = (
+        "Acme Corp, 2021 - Present\n- Lead the data team.\n- Build forecasting models.\n"
+        "Initech, 2017 - 2021\n- Built the reporting stack.\n- Migrated ETL jobs.\n"
+    )
+    assert consistency_issues(text) == []
+    text += "- Manages vendors.\n"
+    assert [issue["word"] for issue in consistency_issues(text)] == ["Mixed tenses within one role: 'Manages' / 'Built'"]
+
+
+def test_bullet_and_date_styles():
+    text = "Acme, Jan 2020 - 03/2022\n- Built a thing\n* Shipped a thing\n"
+    words = [issue["word"] for issue in consistency_issues(text)]
+    assert words == ["Bullet styles: - *", "Date formats: Jan 2020 / 03/2022"]
@@ -0,0 +1,56 @@
+import threading
+
+import pytest
+
+import linkedin_scraper
+from linkedin_scraper import DriverPool
+
+
+class FakeDriver:
+    current_url = "about:blank"
+
+    def __init__(self, slot):
+        self.pool_slot = slot
+
+    def quit(self):
+        pass
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(linkedin_scraper, "POOL_POLL_SECONDS", 0.01)
+    pool = DriverPool(size=1)
+    pool._new_driver = FakeDriver
+    return pool
+
+
+class Cancelled(Exception):
+    pass
+
+
+def test_waiting_for_a_busy_pool_can_be_cancelled(pool):
+    polls = []
+
+    def on_poll():
+        polls.append(1)
+        if len(polls) == 3:
+            raise Cancelled()
+
+    with pool.driver():
+        with pytest.raises(Cancelled):
+            with pool.driver(on_poll=on_poll):
+                pass
+
+
+def test_a_crashed_browser_frees_its_slot_for_a_waiter(pool):
+    crashed = pool._acquire()
+    acquired = []
+    waiter = threading.Thread(target=lambda: acquired.append(pool._acquire()))
+    waiter.start()
+    waiter.join(0.1)
+    assert not acquired
+    # What driver() does when a search hits a WebDriverException
+    pool._discard(crashed)
+    waiter.join(5)
+    assert acquired[0] is not crashed
+    assert acquired[0].pool_slot == 0
@@ -0,0 +1,153 @@
+import threading
+import time
+
+import httpx
+import openai
+import pytest
+
+import llm_scheduler
+from llm_scheduler import BATCH, INTERACTIVE, RateLimitScheduler, TokenBucket
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(llm_scheduler.time, "monotonic", clock)
+    return clock
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def test_token_bucket(clock):
+    bucket = TokenBucket(600, burst_seconds=10)  # 10 per second, holds 100
+    assert bucket.capacity == 100
+    assert bucket.delay(100) == 0
+    bucket.take(80)
+    assert bucket.delay(40) == pytest.approx(2.0)
+    # A request larger than the bucket waits for a full one rather than forever
+    assert bucket.delay(500) == pytest.approx(8.0)
+    clock.now += 1
+    assert bucket.level == 20
+    assert bucket.delay(30) == 0
+    bucket.refund(1000)
+    assert bucket.level == 100
+    bucket.refund(-30)
+    assert bucket.level == 70
+
+
+def test_identical_calls_are_sent_once():
+    scheduler = RateLimitScheduler()
+    release = threading.Event()
+    calls = []
+
+    def send():
+        calls.append(1)
+        release.wait(5)
+        return "answer"
+
+    results, spans = [], [{}, {}]
+    threads = [threading.Thread(target=lambda span=span: results.append(scheduler.call(send, key="k", span=span)))
+               for span in spans]
+    threads[0].start()
+    _wait_for(lambda: calls)
+    threads[1].start()
+    _wait_for(lambda: spans[1].get("coalesced"))
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert results == ["answer", "answer"]
+    assert len(calls) == 1
+    assert "coalesced" not in spans[0]
+    assert scheduler._in_flight == {}
+
+
+def test_followers_get_the_leaders_error():
+    scheduler = RateLimitScheduler()
+    release = threading.Event()
+    errors = []
+
+    def send():
+        release.wait(5)
+        raise ValueError("bad request")
+
+    def call(span):
+        try:
+            scheduler.call(send, key="k", span=span)
+        except ValueError as e:
+            errors.append(e)
+
+    follower = {}
+    leader = threading.Thread(target=call, args=({},))
+    leader.start()
+    _wait_for(lambda: "k" in scheduler._in_flight)
+    thread = threading.Thread(target=call, args=(follower,))
+    thread.start()
+    _wait_for(lambda: follower.get("coalesced"))
+    release.set()
+    leader.join()
+    thread.join()
+    assert len(errors) == 2
+    assert scheduler._in_flight == {}
+
+
+def test_transient_errors_are_retried():
+    scheduler = RateLimitScheduler()
+    scheduler.backoff = lambda attempt, error: 0
+    attempts = []
+
+    def send():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise openai.APIConnectionError(request=httpx.Request("POST", "http://x"))
+        return "answer"
+
+    span = {}
+    assert scheduler.call(send, span=span) == "answer"
+    assert span["retries"] == 2
+
+
+def test_other_errors_are_not_retried():
+    scheduler = RateLimitScheduler()
+    attempts = []
+
+    def send():
+        attempts.append(1)
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        scheduler.call(send)
+    assert len(attempts) == 1
+
+
+def test_interactive_goes_before_waiting_batch_work():
+    scheduler = RateLimitScheduler()
+    # 20 tokens a second, holding 10: each call below waits half a second for a full bucket
+    scheduler._tokens = TokenBucket(1200, burst_seconds=0.5)
+    scheduler._tokens.take(10)
+    order = []
+
+    def acquire(priority):
+        scheduler.acquire(10, priority)
+        order.append(priority)
+
+    batch = threading.Thread(target=acquire, args=(BATCH,))
+    batch.start()
+    _wait_for(lambda: scheduler._waiting)
+    interactive = threading.Thread(target=acquire, args=(INTERACTIVE,))
+    interactive.start()
+    batch.join()
+    interactive.join()
+    assert order == [INTERACTIVE, BATCH]
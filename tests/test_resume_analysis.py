@@ -0,0 +1,105 @@
+import json
+
+import pytest
+
+from resume_analysis import (
+    normalize_fixes,
+    parse_json_response,
+    parse_score,
+    partial_structured_fields,
+    repair_analysis,
+)
+
+ANSWER = {
+    "summary": "Data scientist with \"five\" years in Python.",
+    "strengths": ["Python", "SQL"],
+    "weaknesses": ["No metrics"],
+    "roles": ["Data Scientist", "ML Engineer"],
+    "score": 82,
+    "fixes": [{"issue": "Buzzwords", "score": 7, "details": [{"word": "synergy", "suggestion": "Drop it"}]}],
+}
+
+
+def test_parse_json_response():
+    raw = json.dumps(ANSWER)
+    assert parse_json_response(raw) == ANSWER
+    assert parse_json_response("```json\n" + raw + "\n```") == ANSWER
+    assert parse_json_response("Here you go:\n" + raw + "\nHope that helps!") == ANSWER
+    assert parse_json_response('Fixes: [{"issue": "Buzzwords"}]') == [{"issue": "Buzzwords"}]
+    with pytest.raises(ValueError):
+        parse_json_response("I cannot analyze this resume.")
+
+
+@pytest.mark.parametrize("value, score", [(85, 85), (84.6, 85), ("85/100", 85), ("Score: 120", 100), (-5, 0)])
+def test_parse_score(value, score):
+    assert parse_score(value) == score
+
+
+@pytest.mark.parametrize("value", [True, "none", None])
+def test_parse_score_rejects(value):
+    with pytest.raises(ValueError):
+        parse_score(value)
+
+
+def test_repair_analysis_keeps_valid_fields():
+    result = repair_analysis(ANSWER)
+    assert result["summary"] == ANSWER["summary"]
+    assert result["strengths"] == "- Python\n- SQL"
+    assert result["score"] == 82
+    # Categories the model left out are not filled in with canned examples
+    assert result["fixes"] == [{"issue": "Buzzwords", "score": 7,
+                                "details": [{"word": "synergy", "suggestion": "Drop it"}]}]
+
+
+def test_normalize_fixes_keeps_category_order():
+    fixes = normalize_fixes([{"issue": "Consistency", "score": "11", "details": ["Mixed dates"]},
+                             {"issue": "Weak Verbs", "details": []}, {"issue": "Other", "score": 3}])
+    assert fixes == [
+        {"issue": "Weak Verbs", "score": 5, "details": []},
+        {"issue": "Consistency", "score": 10, "details": [{"word": "Mixed dates", "suggestion": "Consider revising"}]},
+    ]
+    with pytest.raises(ValueError):
+        normalize_fixes([{"issue": "Other"}])
+
+
+def test_repair_analysis_drops_invalid_fields():
+    result = repair_analysis({"summary": "  ", "strengths": [], "score": "n/a", "fixes": [{"issue": "Other"}],
+                              "roles": "Analyst"})
+    assert result == {"roles": "Analyst"}
+    assert repair_analysis(["not", "a", "dict"]) == {}
+
+
+def test_partial_structured_fields_while_streaming():
+    raw = json.dumps(ANSWER)
+    # Halfway through the summary, only the summary so far is known
+    cut = raw.index("five") + 2
+    assert partial_structured_fields(raw[:cut]) == {"summary": 'Data scientist with "fi'}
+    # A list shows its complete items only
+    cut = raw.index('"SQL"') + 3
+    fields = partial_structured_fields(raw[:cut])
+    assert fields["strengths"] == "- Python"
+    # The score is only read once its number has ended
+    cut = raw.index("82") + 1
+    assert "score" not in partial_structured_fields(raw[:cut])
+    fields = partial_structured_fields(raw[:cut + 2])
+    assert fields["score"] == 82
+    assert fields["roles"] == "- Data Scientist\n- ML Engineer"
+
+
+def test_partial_structured_fields_of_nothing():
+    assert partial_structured_fields("") == {}
+    assert partial_structured_fields('{"summary": "') == {}
+
+
+def test_enrich_fixes_merges_only_returned_categories(monkeypatch):
+    import resume_analysis
+    from fix_lexicon import detect_fixes
+
+    local = detect_fixes("Experience\n- Built the billing service.\n- Cut costs by 20%.\n")
+    answer = [{"issue": "Buzzwords", "score": 6, "details": [{"word": "rockstar", "suggestion": "Drop it"}]}]
+    monkeypatch.setattr(resume_analysis, "run_openai_query", lambda *args, **kwargs: json.dumps(answer))
+    fixes = resume_analysis.enrich_fixes("key", ["chunk"], local)
+    assert fixes[1] == {"issue": "Buzzwords", "score": 6, "details": [{"word": "rockstar", "suggestion": "Drop it"}]}
+    # The categories the model left out keep the clean local result
+    assert [fixes[i] for i in (0, 2, 3)] == [local[i] for i in (0, 2, 3)]
+    assert all(fix["score"] == 1 and not fix["details"] for fix in (fixes[0], fixes[2], fixes[3]))
@@ -0,0 +1,46 @@
+import sqlite3
+import time
+
+import task_queue
+from task_queue import TaskQueue, register_handler
+
+
+def _wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def _failing_once(monkeypatch, name, call=1):
+    # Makes the call-th call of TaskQueue.<name> fail as a locked database would
+    method = getattr(TaskQueue, name)
+    calls = []
+
+    def wrapper(self, *args):
+        calls.append(1)
+        if len(calls) == call:
+            raise sqlite3.OperationalError("database is locked")
+        return method(self, *args)
+
+    monkeypatch.setattr(TaskQueue, name, wrapper)
+    return calls
+
+
+def test_worker_survives_database_errors(tmp_path, monkeypatch):
+    _failing_once(monkeypatch, "_claim", call=2)
+    _failing_once(monkeypatch, "_finish")
+    monkeypatch.setattr(task_queue, "IDLE_POLL_SECONDS", 0.05)
+    register_handler("echo", lambda context, value: value)
+    queue = TaskQueue(str(tmp_path / "tasks.sqlite3"), workers=1)
+    for value in (1, 2):
+        task_id = queue.submit("echo", {"value": value})
+        _wait_for(lambda: queue.get(task_id)["status"] == "done")
+        assert queue.get(task_id)["result"] == value
+
+
+def test_heartbeat_survives_database_errors(tmp_path, monkeypatch):
+    calls = _failing_once(monkeypatch, "_heartbeat", call=2)
+    monkeypatch.setattr(task_queue, "HEARTBEAT_SECONDS", 0.01)
+    TaskQueue(str(tmp_path / "tasks.sqlite3"), workers=0)
+    _wait_for(lambda: len(calls) >= 4)
@@ -0,0 +1,92 @@
+import os
+import threading
+
+import numpy as np
+
+from analysis_cache import content_hash, get_cache
+from chunk_planner import count_tokens
+from llm_client import get_registry
+from llm_scheduler import get_scheduler
+from telemetry import estimate_cost, get_telemetry
+
+# Each resume's chunks are embedded once (one batched request) and kept in the
+# analysis cache, keyed by the chunks' content hash, so they share its TTL and size
+# budget. Retrieval is a single matrix-vector product over the normalized float32
+# matrix, so picking chunks per prompt is free after that.
+EMBEDDING_MODEL = os.environ.get("RESUME_ANALYZER_EMBEDDING_MODEL", "text-embedding-3-small")
+EMBEDDING_BATCH_SIZE = 512
+
+_build_locks = {}
+_build_locks_guard = threading.Lock()
+
+
+def _normalize(matrix):
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+class VectorIndex:
+    def __init__(self, vectors):
+        self.vectors = _normalize(vectors)
+
+    def __len__(self):
+        return len(self.vectors)
+
+    def top_k(self, query_vector, k):
+        scores = self.vectors @ _normalize(query_vector)
+        k = min(k, len(scores))
+        best = np.argpartition(-scores, k - 1)[:k]
+        return best[np.argsort(-scores[best])]
+
+
+def embed_texts(api_key, texts, model=EMBEDDING_MODEL):
+    client = get_registry().get_client(api_key)
+    vectors = []
+    for start in range(0, len(texts), EMBEDDING_BATCH_SIZE):
+        batch = texts[start:start + EMBEDDING_BATCH_SIZE]
+        with get_telemetry().span("embedding", model=model, texts=len(batch)) as span:
+            estimate = sum(count_tokens(text, model) for text in batch)
+            response = get_scheduler(model).call(
+                lambda: client.embeddings.create(model=model, input=batch), estimate, content_hash(model, batch), span=span
+            )
+            if not span.get("coalesced"):
+                get_scheduler(model).record_usage(estimate, response.usage.prompt_tokens)
+                span["prompt_tokens"] = response.usage.prompt_tokens
+                span["cost_usd"] = estimate_cost(model, response.usage.prompt_tokens)
+        vectors.extend(item.embedding for item in sorted(response.data, key=lambda item: item.index))
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def build_index(api_key, chunks, model=EMBEDDING_MODEL):
+    key = content_hash(model, chunks)
+    with _build_locks_guard:
+        lock = _build_locks.setdefault(key, threading.Lock())
+    # Concurrent prompts for the same resume wait for one embedding request instead of each sending one
+    try:
+        with lock:
+            vectors = get_cache().get("chunk-embeddings", key)
+            if vectors is None:
+                vectors = embed_texts(api_key, list(chunks), model).tolist()
+                get_cache().set("chunk-embeddings", key, vectors)
+            return VectorIndex(vectors)
+    finally:
+        # Once built, later callers find the vectors in the cache and need no lock
+        with _build_locks_guard:
+            if _build_locks.get(key) is lock:
+                del _build_locks[key]
+
+
+def embed_query(api_key, query, model=EMBEDDING_MODEL):
+    key = content_hash(model, query)
+    vector = get_cache().get("query-embedding", key)
+    if vector is None:
+        vector = embed_texts(api_key, [query], model)[0].tolist()
+        get_cache().set("query-embedding", key, vector)
+    return vector
+
+
+def rank_chunks(api_key, chunks, query):
+    # Every chunk index, most relevant to the query first
+    index = build_index(api_key, chunks)
+    return [int(i) for i in index.top_k(embed_query(api_key, query), len(chunks))]